@@ -0,0 +1,79 @@
+"""分类切换基准：切换到 100 / 1000 / 5000 个工具的分类
+
+在临时目录生成工具箱并在屏幕外显示窗口，计时从选中分类到网格布局、绘制完成。
+每次切换前先经过几个小分类，使目标分类的控件已被回收 (不命中最近分类的控件池)。
+
+    python bench/bench_category_switch.py
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SIZES = (100, 1000, 5000)
+FILLERS = 4  # 比最近分类控件池 (RECENT_SCREENS 屏) 多一个
+ROUNDS = 10
+
+
+def generate(root):
+    from toolbox_core import ToolData, DatabaseManager
+    os.makedirs(os.path.join(root, ".res"))
+    open(os.path.join(root, ".res", "config.ini"), "w").close()  # 全部使用默认配置
+    data = {f"小分类{k}": [ToolData(f"F{k}_{i}", "", f"tools/f{k}_{i}.exe", "") for i in range(20)]
+            for k in range(FILLERS)}
+    for size in SIZES:
+        # 工具文件不存在，图标直接用默认图标，只测界面本身
+        data[f"{size} 个工具"] = [ToolData(f"T{size}_{i}", f"说明 {i}", f"tools/t{size}_{i}.exe", "")
+                              for i in range(size)]
+    db = DatabaseManager(os.path.join(root, ".res", "data.db"))
+    db.create_backup = lambda: None
+    db.save_snapshot(data)
+    db.close()
+    return list(data)
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        names = generate(root)
+        sys.argv = [os.path.join(root, "main.py")]
+        import main as toolbox
+        from PyQt5.QtWidgets import QApplication
+        toolbox.load_config(root)
+        app = QApplication(sys.argv)
+        win = toolbox.MainWindow()
+        win.show()
+        deadline = time.time() + 10
+        while win.category_list.count() < len(names) and time.time() < deadline:
+            app.processEvents()
+
+        rows = {name: i for i, name in enumerate(names)}
+        timings = {size: [] for size in SIZES}
+        for _ in range(ROUNDS):
+            for size in SIZES:
+                for k in range(FILLERS):
+                    win.category_list.setCurrentRow(rows[f"小分类{k}"])
+                    app.processEvents()
+                start = time.perf_counter()
+                win.category_list.setCurrentRow(rows[f"{size} 个工具"])
+                app.processEvents()
+                timings[size].append(time.perf_counter() - start)
+
+        print(f"category switch (select -> laid out and painted), {ROUNDS} rounds")
+        for size in SIZES:
+            samples = timings[size]
+            print(f"{size:5d} tools: median {statistics.median(samples) * 1000:6.1f} ms, "
+                  f"max {max(samples) * 1000:6.1f} ms")
+        win.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
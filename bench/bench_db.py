@@ -0,0 +1,122 @@
+"""数据库读写基准：每次新开连接的旧方式 vs 常驻调优连接 (WAL + executemany)
+
+旧方式照搬改动前的 DatabaseManager：每次操作新开默认连接 (回滚日志、synchronous=FULL)，
+逐行 INSERT。两边都不做保存前备份，只比较读写本身。
+
+    python bench/bench_db.py [工具数]
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from toolbox_core import ToolData, DatabaseManager
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+CATEGORIES = 100
+SINGLE_EDITS = 200
+
+
+class OldDatabase:
+    """改动前的连接用法：每次操作 connect/close，逐行写入"""
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def load_all_data(self):
+        data = {}
+        conn = sqlite3.connect(self.db_path)
+        c = conn.execute("""
+            SELECT c.name, t.id, t.name, t.description, t.path, t.url
+            FROM categories c
+            LEFT JOIN tools t ON t.category_id = c.id
+            ORDER BY c.sort_order ASC, c.id ASC, t.sort_order ASC, t.id ASC
+        """)
+        for cat_name, tool_id, name, desc, path, url in c:
+            tools = data.setdefault(cat_name, [])
+            if tool_id is not None:
+                tools.append(ToolData(name, desc, path, url, tool_id))
+        conn.close()
+        return data
+
+    def save_snapshot(self, data_dict):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("BEGIN TRANSACTION")
+        conn.execute("DELETE FROM tools")
+        conn.execute("DELETE FROM categories")
+        for cat_index, (cat_name, tools_list) in enumerate(data_dict.items()):
+            cat_id = conn.execute("INSERT INTO categories (name, sort_order) VALUES (?, ?)",
+                                  (cat_name, cat_index)).lastrowid
+            for tool_index, tool in enumerate(tools_list):
+                tool.row_id = conn.execute("""
+                    INSERT INTO tools (category_id, name, description, path, url, sort_order)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (cat_id, tool.name, tool.desc, tool.path, tool.url, tool_index)).lastrowid
+        conn.commit()
+        conn.close()
+
+    def apply_changes(self, data_dict, changes):
+        # 基准里只用到 edit_tool
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("BEGIN TRANSACTION")
+        for op, tool in changes:
+            conn.execute("UPDATE tools SET name=?, description=?, path=?, url=? WHERE id=?",
+                         (tool.name, tool.desc, tool.path, tool.url, tool.row_id))
+        conn.commit()
+        conn.close()
+
+
+def make_data():
+    return {f"分类{k}": [ToolData(f"Tool{k}_{i}", f"工具说明 {i % 50}", f"tools/{k}/Tool{i}.exe", "")
+                        for i in range(TOOLS // CATEGORIES)] for k in range(CATEGORIES)}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(db):
+    """返回 {场景: 毫秒}"""
+    results = {"save_snapshot": min(timed(lambda: db.save_snapshot(make_data())) for _ in range(3))}
+    results["load_all_data"] = min(timed(db.load_all_data) for _ in range(5))
+    data = db.load_all_data()
+    tools = data["分类0"]
+
+    def single_edit_saves():
+        # 每次只改一个工具就保存 (界面上编辑后退出/常驻模式定期保存的情形)
+        for i in range(SINGLE_EDITS):
+            tool = tools[i % len(tools)]
+            tool.desc = f"edited {i}"
+            db.apply_changes(data, [("edit_tool", tool)])
+    results[f"{SINGLE_EDITS} single-edit saves"] = timed(single_edit_saves)
+    return results
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        old_path = os.path.join(root, "old", ".res", "data.db")
+        new_path = os.path.join(root, "new", ".res", "data.db")
+        # 旧库使用默认的回滚日志 (DELETE)，表结构和索引与新库相同
+        DatabaseManager(old_path, journal_mode="DELETE").close()
+        new_db = DatabaseManager(new_path)
+        new_db.create_backup = lambda: None
+
+        print(f"{TOOLS} tools in {CATEGORIES} categories")
+        old = run(OldDatabase(old_path))
+        new = run(new_db)
+        new_db.close()
+        print(f"{'':26s} {'before':>10s} {'after':>10s}")
+        for label in old:
+            print(f"{label:26s} {old[label]:8.1f} ms {new[label]:8.1f} ms  {old[label] / new[label]:5.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
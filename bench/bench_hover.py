@@ -0,0 +1,103 @@
+"""悬停基准：鼠标扫过整个网格时每个图标的 进入 + 离开 耗时
+
+之前：每个 ToolItem 和名称标签各有自己的样式表，进入/离开时 setStyleSheet 换一份 (重新解析并 polish)；
+现在：应用级样式表 + 动态属性 state (ToolItem.set_state)。两种方式都在屏幕外同步重绘每个控件。
+
+    python bench/bench_hover.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+TOOLS = 3000
+ROUNDS = 5
+
+# 改动前每个控件使用的样式表 (STYLES 中的 TOOL_ITEM_NORMAL / TOOL_ITEM_HOVER / TOOL_NAME)
+OLD_NORMAL = "QWidget#ToolItem { background: transparent; border: none; border-radius: 5px; }"
+OLD_HOVER = ("QWidget#ToolItem { background: rgba(255, 255, 255, 40); "
+             "border: 1px solid rgba(255, 255, 255, 50); border-radius: 5px; }")
+
+
+def old_name_style(cfg):
+    return (f"color: {cfg['TEXT_COLOR']}; font-size: {cfg['FONT_SIZES']['TOOL_NAME']}px; "
+            f"font-family: '{cfg['FONT_FAMILY']}'; background: transparent; border: none;")
+
+
+def generate(root):
+    from toolbox_core import ToolData, DatabaseManager
+    os.makedirs(os.path.join(root, ".res"))
+    open(os.path.join(root, ".res", "config.ini"), "w").close()  # 全部使用默认配置
+    data = {"悬停": [ToolData(f"Tool{i}", f"说明 {i}", f"tools/t{i}.exe", "") for i in range(TOOLS)]}
+    db = DatabaseManager(os.path.join(root, ".res", "data.db"))
+    db.create_backup = lambda: None
+    db.save_snapshot(data)
+    db.close()
+
+
+def sweep(app, items, enter, leave):
+    """返回最快一轮的总耗时"""
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for item in items:
+            enter(item)
+            item.repaint()
+            leave(item)
+            item.repaint()
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        generate(root)
+        sys.argv = [os.path.join(root, "main.py")]
+        import main as toolbox
+        from PyQt5.QtCore import QEvent
+        from PyQt5.QtWidgets import QApplication
+        toolbox.load_config(root)
+        app = QApplication(sys.argv)
+        win = toolbox.MainWindow()
+        win.show()
+        deadline = time.time() + 10
+        while not win.responsive_container.widgets and time.time() < deadline:
+            app.processEvents()
+        items = list(win.responsive_container.widgets.values())
+
+        enter_event, leave_event = QEvent(QEvent.Enter), QEvent(QEvent.Leave)
+        after = sweep(app, items, lambda it: it.enterEvent(enter_event), lambda it: it.leaveEvent(leave_event))
+
+        # 恢复旧的做法：没有应用级样式表，每个控件自带样式表，悬停时整份替换
+        app.setStyleSheet("")
+        win.responsive_container.setStyleSheet("background: transparent;")
+        name_style = old_name_style(toolbox.USER_CONFIG)
+        for item in items:
+            item.text_label.setStyleSheet(name_style)
+            item.setStyleSheet(OLD_NORMAL)
+
+        def old_enter(item):
+            item.setStyleSheet(OLD_HOVER)
+            win.update_description(f"{item.tool_data.name} : {item.tool_data.desc}")
+
+        before = sweep(app, items, old_enter, lambda it: it.setStyleSheet(OLD_NORMAL))
+
+        print(f"hover sweep over {len(items)} grid items (enter + leave + repaint each), best of {ROUNDS}")
+        for label, elapsed in (("before (per-widget setStyleSheet)", before), ("after (app sheet + state property)", after)):
+            print(f"{label:36s} {elapsed * 1000:7.1f} ms  {elapsed / len(items) * 1e6:5.0f} us per item")
+        print(f"speedup {before / after:.1f}x")
+        win.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""启动基准：图标磁盘缓存 (.res/icon_cache) 冷 / 热
+
+在临时目录生成一个工具箱 (工具文件 + icons 文件夹中的大尺寸 PNG)，每次在新进程中启动窗口，
+计时从创建 MainWindow 到所有分类的图标就绪。冷启动前清空缓存目录，热启动沿用上一次写入的缓存。
+
+    python bench/bench_icon_cache.py [工具数]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != "--child" else 2000
+CATEGORIES = 20
+RUNS = 3
+
+
+def generate(root):
+    """工具文件和数据库；每 4 个工具有一个 256x256 的自定义图标"""
+    from PyQt5.QtGui import QImage, QColor
+    from toolbox_core import ToolData, DatabaseManager
+    os.makedirs(os.path.join(root, ".res"))
+    os.makedirs(os.path.join(root, "tools"))
+    os.makedirs(os.path.join(root, "icons"))
+    open(os.path.join(root, ".res", "config.ini"), "w").close()  # 全部使用默认配置
+
+    exts = (".exe", ".bat", ".lnk", ".sh", ".txt")
+    data = {f"分类{k}": [] for k in range(CATEGORIES)}
+    for i in range(TOOLS):
+        rel = f"tools/tool{i}{exts[i % len(exts)]}"
+        with open(os.path.join(root, rel), "w") as f:
+            f.write("x")
+        if i % 4 == 0:
+            image = QImage(256, 256, QImage.Format_ARGB32)
+            image.fill(QColor.fromHsv(i % 360, 200, 220))
+            image.save(os.path.join(root, "icons", f"Tool{i}.png"))
+        data[f"分类{i % CATEGORIES}"].append(ToolData(f"Tool{i}", "", rel, ""))
+    db = DatabaseManager(os.path.join(root, ".res", "data.db"))
+    db.create_backup = lambda: None
+    db.save_snapshot(data)
+    db.close()
+
+
+def child(root):
+    """在 root 工具箱中启动窗口，打印图标全部就绪的耗时 (毫秒)"""
+    sys.argv = [os.path.join(root, "main.py")]
+    import main
+    from PyQt5.QtWidgets import QApplication
+    main.load_config(root)
+    app = QApplication(sys.argv)
+    start = time.perf_counter()
+    win = main.MainWindow()
+    win.first_painted.connect(lambda: win.icon_loader.idle.connect(app.quit))
+    win.show()
+    app.exec_()
+    elapsed = time.perf_counter() - start
+    win.icon_loader.pool.waitForDone()  # 缩略图在后台写盘，等写完再统计
+    print(f"{elapsed * 1000:.1f} {len(os.listdir(win.icon_disk_cache.cache_dir))}")
+
+
+def run_child(root):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", root],
+                         env=env, capture_output=True, text=True, check=True).stdout
+    elapsed, entries = out.split()[-2:]
+    return float(elapsed), int(entries)
+
+
+def main():
+    if os.environ.get("QT_QPA_PLATFORM") is None:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])  # 生成测试图标需要 QApplication
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        generate(root)
+        del app
+        cache_dir = os.path.join(root, ".res", "icon_cache")
+        print(f"{TOOLS} tools in {CATEGORIES} categories, best of {RUNS} (startup -> all icons ready)")
+
+        cold = []
+        for _ in range(RUNS):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(run_child(root))
+        warm = [run_child(root) for _ in range(RUNS)]
+
+        cold_ms, warm_ms = min(t for t, _ in cold), min(t for t, _ in warm)
+        print(f"cold icon cache: {cold_ms:8.1f} ms  ({cold[-1][1]} thumbnails written)")
+        print(f"warm icon cache: {warm_ms:8.1f} ms")
+        print(f"speedup {cold_ms / warm_ms:.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,94 @@
+"""load_all_data 基准：旧的逐分类查询 vs 单次 JOIN
+
+在临时目录生成一个 5 万工具的数据库 (旧版表结构、无索引)，先用旧加载方式计时，
+再由 DatabaseManager 执行结构迁移 (添加索引) 后用新加载方式计时。
+
+    python bench/bench_load.py [工具数] [分类数]
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from toolbox_core import ToolData, DatabaseManager
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+CATEGORIES = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+REPEAT = 5
+
+
+def generate(db_path):
+    """建立与旧版 init_db 相同的表结构并写入测试数据"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE, sort_order INTEGER DEFAULT 0);
+        CREATE TABLE tools (id INTEGER PRIMARY KEY AUTOINCREMENT, category_id INTEGER, name TEXT, description TEXT,
+                            path TEXT, url TEXT, sort_order INTEGER DEFAULT 0,
+                            FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE);
+    ''')
+    conn.executemany("INSERT INTO categories (id, name, sort_order) VALUES (?, ?, ?)",
+                     [(i + 1, f"分类{i}", i) for i in range(CATEGORIES)])
+    # 工具按随机分类交错插入，和长期使用后的数据库一样不按分类聚集
+    conn.executemany("INSERT INTO tools (category_id, name, description, path, url, sort_order) VALUES (?, ?, ?, ?, ?, ?)",
+                     [(i * 7919 % CATEGORIES + 1, f"Tool{i}", f"工具说明 {i % 50}", f"tools/t{i}/Tool{i}.exe",
+                       "", i // CATEGORIES) for i in range(TOOLS)])
+    conn.commit()
+    conn.close()
+
+
+def load_per_category(db_path):
+    """旧实现：每个分类一次 SELECT"""
+    data = {}
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("SELECT id, name FROM categories ORDER BY sort_order ASC")
+    for cat_id, cat_name in c.fetchall():
+        c.execute("SELECT name, description, path, url FROM tools WHERE category_id=? ORDER BY sort_order ASC", (cat_id,))
+        data[cat_name] = [ToolData(*row) for row in c.fetchall()]
+    conn.close()
+    return data
+
+
+def best_of(fn):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        db_path = os.path.join(root, ".res", "data.db")
+        os.makedirs(os.path.dirname(db_path))
+        generate(db_path)
+        print(f"{TOOLS} tools in {CATEGORIES} categories, best of {REPEAT}")
+
+        old_time, old_data = best_of(lambda: load_per_category(db_path))
+        print(f"per-category SELECT (no indexes): {old_time * 1000:8.1f} ms")
+
+        def load_new():
+            # 与启动时一致：打开连接 (含迁移检查) 后整体读取
+            db = DatabaseManager(db_path)
+            try:
+                return db.load_all_data()
+            finally:
+                db.close()
+        new_time, new_data = best_of(load_new)
+        print(f"single JOIN (indexed):            {new_time * 1000:8.1f} ms")
+
+        same = [(k, [t.name for t in v]) for k, v in old_data.items()] == \
+               [(k, [t.name for t in v]) for k, v in new_data.items()]
+        print(f"speedup {old_time / new_time:.1f}x, identical result: {same}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
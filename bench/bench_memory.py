@@ -0,0 +1,105 @@
+"""内存基准 (tracemalloc)：10 万工具的目录在内存中占用多少
+
+旧方式照搬改动前的 ToolData (普通类，每个实例一个 __dict__，说明/网址字符串各存一份)；
+新方式是 DatabaseManager.load_all_data 返回的 __slots__ ToolData (重复字符串共用)。
+两边都包含 ToolCatalog 按 uid 建立的分类索引 (locations)。
+
+    python bench/bench_memory.py [工具数]
+"""
+import gc
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from toolbox_core import DatabaseManager
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+CATEGORIES = 100
+
+
+class OldToolData:
+    """改动前的 ToolData"""
+    def __init__(self, name, desc, path, url, row_id=None):
+        self.name = name
+        self.desc = desc
+        self.path = path
+        self.url = url
+        self.row_id = row_id
+
+
+def generate(db_path):
+    db = DatabaseManager(db_path)
+    db.close()
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO categories (id, name, sort_order) VALUES (?, ?, ?)",
+                     [(i + 1, f"分类{i}", i) for i in range(CATEGORIES)])
+    # 同一套件的工具说明/网址相同，这里一半工具有说明、三分之一有网址
+    conn.executemany("INSERT INTO tools (id, category_id, name, description, path, url, sort_order) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     [(i + 1, i % CATEGORIES + 1, f"Tool{i}", "" if i % 2 else f"工具说明 {i % 50}",
+                       f"tools/分类{i % CATEGORIES}/Tool{i}/Tool{i}.exe",
+                       "" if i % 3 else f"https://example.com/suite{i % 20}", i) for i in range(TOOLS)])
+    conn.commit()
+    conn.close()
+
+
+def load_old(db_path):
+    data = {}
+    conn = sqlite3.connect(db_path)
+    for cat_name, tool_id, name, desc, path, url in conn.execute("""
+            SELECT c.name, t.id, t.name, t.description, t.path, t.url
+            FROM categories c LEFT JOIN tools t ON t.category_id = c.id
+            ORDER BY c.sort_order, c.id, t.sort_order, t.id"""):
+        tools = data.setdefault(cat_name, [])
+        if tool_id is not None:
+            tools.append(OldToolData(name, desc, path, url, tool_id))
+    conn.close()
+    # 旧版按对象在列表中查找，没有分类索引
+    return data, None
+
+
+def load_new(db_path):
+    db = DatabaseManager(db_path)
+    data = db.load_all_data()
+    db.close()
+    locations = {tool.uid: name for name, tools in data.items() for tool in tools}
+    return data, locations
+
+
+def measure(load, db_path):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = load(db_path)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current, peak, elapsed
+
+
+def main():
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    try:
+        db_path = os.path.join(root, ".res", "data.db")
+        generate(db_path)
+        print(f"{TOOLS} tools in {CATEGORIES} categories")
+        results = {}
+        for label, load in (("before (dict ToolData)", load_old), ("after (__slots__ + uid index)", load_new)):
+            current, peak, elapsed = measure(load, db_path)
+            results[label] = current
+            print(f"{label:30s} held {current / 1e6:6.1f} MB  peak {peak / 1e6:6.1f} MB  load {elapsed * 1000:5.0f} ms")
+        before, after = results.values()
+        print(f"saved {(before - after) / 1e6:.1f} MB ({(before - after) / TOOLS:.0f} bytes per tool)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""搜索索引微基准：5 万工具目录上的查询耗时 (目标 < 5 ms)
+
+分别计时：加载时建索引、建好后的第一次查询、各类查询、零散编辑 / 删除 / 新增之后的第一次查询。
+查询词选的是命中少于结果上限的词，需要扫描全部文本 (最慢的情况)。
+
+    python bench/bench_search.py [工具数]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from main import SearchIndex
+from toolbox_core import ToolData
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+TARGET_MS = 5.0
+WORDS = ("net", "scan", "hex", "dump", "edit", "view", "pe", "reg", "mon", "spy", "zip", "disk",
+         "备份", "抓包", "调试", "反编译", "截图", "远程", "工具", "分析")
+QUERIES = {
+    "name prefix": "hexdump",
+    "name substring": "spy5",
+    "desc/path substring": "说明 12345",
+    "no match": "qqqq",
+}
+
+
+def generate(rng):
+    data = {}
+    for i in range(TOOLS):
+        name = "".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + str(i)
+        tool = ToolData(name, f"{rng.choice(WORDS)}说明 {i}", f"tools/{rng.choice(WORDS)}/{name}.exe", "")
+        data.setdefault(f"分类{i % 300}", []).append(tool)
+    return data
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def report(label, ms, extra=""):
+    flag = "ok" if ms < TARGET_MS else "SLOW"
+    print(f"{label:38s} {ms:7.2f} ms  {flag} {extra}")
+    return ms < TARGET_MS
+
+
+def main():
+    rng = random.Random(9)
+    data = generate(rng)
+    tools = [tool for tools in data.values() for tool in tools]
+    index = SearchIndex()
+
+    ms, _ = timed(lambda: index.rebuild(data))
+    print(f"{TOOLS} tools, target < {TARGET_MS:.0f} ms per query")
+    print(f"{'rebuild (at load, not a query)':38s} {ms:7.2f} ms")
+
+    ok = True
+    ms, hits = timed(lambda: index.search(QUERIES["no match"]))
+    ok &= report("first query after rebuild", ms)
+
+    for label, query in QUERIES.items():
+        samples = []
+        for _ in range(20):
+            ms, hits = timed(lambda: index.search(query))
+            samples.append(ms)
+        ok &= report(f"{label} (max of 20)", max(samples),
+                     f"median {statistics.median(samples):.2f} ms, {len(hits)} hits")
+
+    # 零散编辑：每次编辑后立即查询 (编辑触发的刷新)
+    worst = 0.0
+    for tool in rng.sample(tools, 10):
+        tool.desc += " edited"
+        index.update(tool)
+        ms, _ = timed(lambda: index.search(QUERIES["no match"]))
+        worst = max(worst, ms)
+    ok &= report("query after each of 10 scattered edits", worst)
+
+    # 大量编辑、删除、新增之后 (不留空位，块数不增长)
+    blocks_before = len(index.blocks)
+    for tool in rng.sample(tools, 2000):
+        tool.name += "x"
+        index.update(tool)
+    for tool in rng.sample(tools, 2000):
+        index.remove(tool)
+    for i in range(2000):
+        index.add(ToolData(f"新工具{i}", "", f"tools/new/{i}.exe", ""))
+    index.search(QUERIES["no match"])  # 重新拼接被改动的块
+    samples = [timed(lambda: index.search(QUERIES["no match"]))[0] for _ in range(20)]
+    ok &= report("query after 6000 edits/removes/adds", max(samples),
+                 f"blocks {blocks_before} -> {len(index.blocks)}")
+
+    print("all queries under target" if ok else "SOME QUERIES OVER TARGET")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
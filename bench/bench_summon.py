@@ -0,0 +1,113 @@
+"""单实例基准：冷启动到首帧 vs 唤起已在运行的常驻实例
+
+在临时目录生成工具箱 (复制程序文件 + 生成数据库)，在屏幕外平台上：
+  冷启动：运行 main.py，计时到实例开始监听本地套接字 (首帧绘制后立即监听)；
+  唤起：  先以 --resident 常驻，再计时每次运行 main.py (只转发 show 命令后退出) 的总耗时。
+两种计时都从创建进程开始，包含 Python 解释器自身的启动。
+
+    python bench/bench_summon.py [工具数]
+"""
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+CATEGORIES = 20
+RUNS = 5
+TIMEOUT = 30
+
+
+def generate(root):
+    from toolbox_core import ToolData, DatabaseManager
+    for path in glob.glob(os.path.join(REPO_DIR, "*.py")):
+        shutil.copy(path, root)
+    os.makedirs(os.path.join(root, ".res"))
+    open(os.path.join(root, ".res", "config.ini"), "w").close()  # 全部使用默认配置
+    data = {f"分类{k}": [ToolData(f"Tool{k}_{i}", "", f"tools/{k}/{i}.exe", "")
+                        for i in range(TOOLS // CATEGORIES)] for k in range(CATEGORIES)}
+    db = DatabaseManager(os.path.join(root, ".res", "data.db"))
+    db.create_backup = lambda: None
+    db.save_snapshot(data)
+    db.close()
+
+
+def server_path(root):
+    """实例套接字/命名管道出现即表示实例已在监听"""
+    from toolbox_instance import instance_server_name
+    name = instance_server_name(root)
+    return "\\\\.\\pipe\\" + name if os.name == 'nt' else name
+
+
+def run_main(root, *args):
+    return subprocess.run([sys.executable, os.path.join(root, "main.py"), *args],
+                          cwd=root, capture_output=True, timeout=TIMEOUT)
+
+
+def wait_for(predicate):
+    deadline = time.perf_counter() + TIMEOUT
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("instance did not start")
+        time.sleep(0.001)
+
+
+def cold_start(root):
+    """冷启动到首帧 (实例开始监听) 的耗时，结束后让实例退出"""
+    path = server_path(root)
+    if os.name != 'nt' and os.path.exists(path):
+        os.remove(path)  # 上一轮退出可能留下套接字文件
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(root, "main.py")], cwd=root,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for(lambda: os.path.exists(path))
+    elapsed = time.perf_counter() - start
+    run_main(root, "--quit")
+    proc.wait(TIMEOUT)
+    return elapsed
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    root = tempfile.mkdtemp(prefix="llsky9_bench_")
+    resident = None
+    try:
+        generate(root)
+        print(f"{TOOLS} tools in {CATEGORIES} categories, {RUNS} runs each (process spawn included)")
+        cold = [cold_start(root) for _ in range(RUNS)]
+
+        if os.name != 'nt' and os.path.exists(server_path(root)):
+            os.remove(server_path(root))
+        resident = subprocess.Popen([sys.executable, os.path.join(root, "main.py"), "--resident"], cwd=root,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wait_for(lambda: os.path.exists(server_path(root)))
+        summon = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            run_main(root)  # 发现已有实例：转发 show 后退出
+            summon.append(time.perf_counter() - start)
+        run_main(root, "--quit")
+        resident.wait(TIMEOUT)
+        resident = None
+
+        for label, samples in (("cold start -> first paint", cold), ("summon resident instance", summon)):
+            print(f"{label:28s} median {statistics.median(samples) * 1000:7.1f} ms, "
+                  f"min {min(samples) * 1000:7.1f} ms")
+        print(f"speedup {statistics.median(cold) / statistics.median(summon):.1f}x")
+    finally:
+        if resident is not None:
+            resident.kill()
+        if os.name != 'nt' and os.path.exists(server_path(root)):
+            os.remove(server_path(root))
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
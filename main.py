@@ -1,359 +1,1761 @@
 import sys
 import os
-import sqlite3
 import time
-import subprocess
+
+# ==========================================
+#      启动耗时分析 (可选)
+# ==========================================
+class StartupProfiler:
+    """记录启动各阶段的时间点，LLSKY9_PROFILE_STARTUP=1 或 --profile-startup 时开启
+
+    时间从 main.py 开始执行算起 (不含 Python 解释器自身启动)，图标全部就绪后打印时间线。
+    """
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, phase):
+        if self.enabled and not self.reported:
+            self.marks.append((phase, time.perf_counter()))
+
+    def finish(self, phase):
+        """记录最后一个阶段并打印时间线 (只打印一次)"""
+        if not self.enabled or self.reported:
+            return
+        self.mark(phase)
+        self.reported = True
+        last = self.t0
+        print("[startup] timeline (ms from main.py start):")
+        for name, t in self.marks:
+            print(f"[startup] {(t - self.t0) * 1000:8.1f}  (+{(t - last) * 1000:6.1f})  {name}")
+            last = t
+
+
+STARTUP = StartupProfiler(bool(os.environ.get("LLSKY9_PROFILE_STARTUP")) or "--profile-startup" in sys.argv)
+
 import threading
 import configparser
-import shutil  # 【新增】用于文件复制
+import hashlib
+from bisect import bisect_left, bisect_right
+from collections import deque, OrderedDict
+from operator import attrgetter
+
+# ==========================================
+#      单实例快速通道 (只依赖标准库)
+# ==========================================
+from toolbox_instance import instance_server_name, send_to_instance
+
+
+def parse_instance_args(argv):
+    """解析单实例相关参数，返回 (发送给实例的命令, 是否常驻启动)
+
+    main.py             显示窗口 (已有实例时唤起它)
+    main.py --resident  常驻后台启动，关闭窗口只隐藏
+    main.py --launch 名称  让常驻实例启动指定工具
+    main.py --quit      退出常驻实例
+    """
+    message, resident = "show", False
+    if "--resident" in argv:
+        resident = True
+    if "--launch" in argv:
+        index = argv.index("--launch")
+        if index + 1 < len(argv):
+            message = "run " + argv[index + 1]
+    if "--quit" in argv:
+        message = "quit"
+    return message, resident
+
+
+CLI_COMMANDS = ("list", "run", "backups", "restore", "fix-paths")
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+    # 命令行模式：不导入 Qt，直接读库启动
+    from toolbox_cli import main as cli_main
+    sys.exit(cli_main(os.path.dirname(os.path.abspath(sys.argv[0])), sys.argv[1:]))
+
+if __name__ == "__main__":
+    # 已有实例在运行：只转发命令，跳过 PyQt5 导入、配置加载和界面构建
+    _message, _resident = parse_instance_args(sys.argv[1:])
+    if send_to_instance(instance_server_name(os.path.dirname(os.path.abspath(sys.argv[0]))), _message):
+        sys.exit(0)
+    if _message == "quit":
+        sys.exit(0)
+
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QWidget, 
     QListWidget, QListWidgetItem, QScrollArea, 
     QFrame, QFileIconProvider, QVBoxLayout,
     QMessageBox, QInputDialog, QMenu, QAction,
     QDialog, QLineEdit, QPushButton, QGridLayout, QFileDialog,
-    QAbstractItemView
+    QAbstractItemView, QShortcut, QProgressDialog
+)
+from PyQt5.QtCore import (
+    Qt, QFileInfo, QPoint, QTimer, QThread, QUrl, QRectF,
+    QObject, QRunnable, QThreadPool, QFileSystemWatcher, QPropertyAnimation, QEasingCurve, pyqtSignal
 )
-from PyQt5.QtCore import Qt, QFileInfo, QPoint, QTimer, QThread, QUrl, QRectF
-from PyQt5.QtGui import QPixmap, QFont, QDesktopServices, QPainter, QPainterPath, QBrush, QColor
+from PyQt5 import sip
+from PyQt5.QtGui import QPixmap, QImage, QKeySequence, QFont, QDesktopServices, QPainter, QPainterPath, QBrush, QColor
+from toolbox_core import ToolData, DatabaseManager, resolve_tool_path, spawn_tool
+# subprocess / concurrent.futures / QtNetwork 等首屏用不到的模块在使用处再导入
+
+STARTUP.mark("imports")
+
+# ==========================================
+#      图标内存缓存 (按字节预算的 LRU)
+# ==========================================
+class IconCache:
+    """键为 (图标来源文件, 尺寸)，超出字节预算时淘汰最久未使用的图标"""
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (QPixmap, 字节数)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key):
+        """读取但不影响 LRU 顺序和统计"""
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def put(self, key, pixmap):
+        old = self.entries.pop(key, None)
+        if old:
+            self.total_bytes -= old[1]
+        nbytes = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self.entries[key] = (pixmap, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+
+    def discard(self, key):
+        old = self.entries.pop(key, None)
+        if old:
+            self.total_bytes -= old[1]
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        # 至少保留刚放入的一项
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 # ==========================================
 #           全局配置与缓存
 # ==========================================
 USER_CONFIG = {}
-ICON_CACHE = {}
+ICON_CACHE = IconCache()
 
 # ==========================================
-#      数据对象类 (内存中操作的对象)
+#      工具位置表 (按 uid 找下标，代替 list.index)
 # ==========================================
-class ToolData:
-    def __init__(self, name, desc, path, url):
-        self.name = name
-        self.desc = desc
-        self.path = path
-        self.url = url
+class ToolPositions:
+    """包装一个 [ToolData]，维护 uid -> 下标，增删都经过这里
+
+    插入/删除只把"已登记"的范围 valid 截到变动处，之后的下标在下次查询时一次性重算；
+    变动处之前的和追加到末尾的工具不受影响，查询它们是 O(1)。
+    """
+    __slots__ = ("items", "pos", "valid")
+    _uid = attrgetter("uid")
+
+    def __init__(self, items):
+        self.items = items
+        self.pos = {}    # uid -> 下标 (只有 items[:valid] 的保证正确)
+        self.valid = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def index(self, tool):
+        """返回工具的下标，不在列表中时返回 None"""
+        i = self.pos.get(tool.uid)
+        if i is not None and i < self.valid:
+            return i
+        items = self.items
+        if self.valid < len(items):
+            self.pos.update(zip(map(self._uid, items[self.valid:]), range(self.valid, len(items))))
+            self.valid = len(items)
+        return self.pos.get(tool.uid)
+
+    def __contains__(self, tool):
+        return self.index(tool) is not None
+
+    def insert(self, index, tool):
+        """插入并返回实际位置 (超出末尾时追加)"""
+        items = self.items
+        if index >= len(items):
+            index = len(items)
+            if self.valid == index:
+                self.pos[tool.uid] = index
+                self.valid += 1
+        else:
+            self.valid = min(self.valid, index)
+        items.insert(index, tool)
+        return index
+
+    def extend(self, tools):
+        start = len(self.items)
+        self.items.extend(tools)
+        if self.valid == start:
+            self.pos.update(zip(map(self._uid, tools), range(start, len(self.items))))
+            self.valid = len(self.items)
+
+    def remove(self, tool):
+        """删除并返回原下标，不在列表中时返回 None"""
+        i = self.index(tool)
+        if i is None:
+            return None
+        self.items.pop(i)
+        del self.pos[tool.uid]
+        self.valid = min(self.valid, i)
+        return i
 
 # ==========================================
-#      数据库管理类 (只负责读和整体写)
+#      数据模型：带变更通知的工具目录
 # ==========================================
-class DatabaseManager:
-    def __init__(self, db_path):
-        self.db_path = db_path
-        # 确保数据库所在的文件夹存在
-        db_dir = os.path.dirname(db_path)
-        if not os.path.exists(db_dir):
-            try:
-                os.makedirs(db_dir)
-            except Exception as e:
-                print(f"Error creating directory {db_dir}: {e}")
-        self.init_db()
-
-    def get_connection(self):
-        return sqlite3.connect(self.db_path)
-
-    def init_db(self):
-        """初始化数据库表结构"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS categories (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT UNIQUE,
-                        sort_order INTEGER DEFAULT 0
-                     )''')
-        c.execute('''CREATE TABLE IF NOT EXISTS tools (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        category_id INTEGER,
-                        name TEXT,
-                        description TEXT,
-                        path TEXT,
-                        url TEXT,
-                        sort_order INTEGER DEFAULT 0,
-                        FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE
-                     )''')
-        conn.commit()
-        conn.close()
-
-    def load_all_data(self):
-        """读取数据库，加载到内存字典中"""
-        data = {}
-        conn = self.get_connection()
-        c = conn.cursor()
-        
-        # 1. 查分类 (按 sort_order 排序)
-        c.execute("SELECT id, name FROM categories ORDER BY sort_order ASC")
-        categories = c.fetchall()
-        
-        for cat_id, cat_name in categories:
-            tool_list = []
-            # 2. 查工具 (按 sort_order 排序)
-            c.execute("SELECT name, description, path, url FROM tools WHERE category_id=? ORDER BY sort_order ASC", (cat_id,))
-            tools = c.fetchall()
-            for row in tools:
-                tool_obj = ToolData(row[0], row[1], row[2], row[3])
-                tool_list.append(tool_obj)
-            
-            data[cat_name] = tool_list 
-            
-        conn.close()
-        return data
+class ToolCatalog(QObject):
+    """内存中的 {分类: [ToolData]}，所有修改都经过这里
+
+    每次修改都会记录一条增量操作 (保存时交给 DatabaseManager.apply_changes)，
+    并发出精确的变更信号，界面据此只更新受影响的控件。
+    """
+    reset = pyqtSignal()
+    category_added = pyqtSignal(str, int)        # 名称, 位置
+    category_renamed = pyqtSignal(str, str)      # 旧名称, 新名称
+    category_removed = pyqtSignal(str, object)   # 名称, 被删除的工具列表
+    categories_reordered = pyqtSignal()
+    tool_inserted = pyqtSignal(str, int, object) # 分类, 位置, ToolData
+    tools_added = pyqtSignal(str, object)        # 分类, 追加到末尾的 [ToolData] (批量导入)
+    tool_updated = pyqtSignal(object)
+    tool_removed = pyqtSignal(str, int, object)  # 分类, 原位置, ToolData
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data = {}
+        self.pending_changes = []  # 自上次保存以来的增量修改记录
+        self.locations = {}        # ToolData.uid -> 所在分类，编辑/删除时 O(1) 找到分类
+        self.positions = {}        # 分类 -> ToolPositions，删除/移动时按 uid 找下标 (用到时才创建)
+
+    @property
+    def is_dirty(self):
+        return bool(self.pending_changes)
+
+    def load(self, data):
+        self.data = data
+        self.pending_changes = []
+        self.locations = {tool.uid: name for name, tools in data.items() for tool in tools}
+        self.positions = {}
+        self.reset.emit()
+
+    def mark_saved(self):
+        """修改已写入数据库 (常驻模式下窗口关闭后进程仍在，需要清空记录)"""
+        self.pending_changes = []
+
+    def record_change(self, op, *args):
+        self.pending_changes.append((op,) + args)
+
+    # ---------- 分类 ----------
+    def add_category(self, name):
+        if name in self.data:
+            return False
+        self.data[name] = []
+        self.record_change("add_category", name)
+        self.category_added.emit(name, len(self.data) - 1)
+        return True
+
+    def rename_category(self, old_name, new_name):
+        if old_name not in self.data or new_name in self.data:
+            return False
+        new_data = {}
+        for k, v in self.data.items():
+            if k == old_name: new_data[new_name] = v
+            else: new_data[k] = v
+        self.data = new_data
+        for tool in new_data[new_name]:
+            self.locations[tool.uid] = new_name
+        if old_name in self.positions:
+            self.positions[new_name] = self.positions.pop(old_name)
+        self.record_change("rename_category", old_name, new_name)
+        self.category_renamed.emit(old_name, new_name)
+        return True
 
-    def create_backup(self):
-        """【新增】创建备份并保留最新的5个"""
-        if not os.path.exists(self.db_path):
+    def remove_category(self, name):
+        if name not in self.data:
+            return False
+        tools = self.data.pop(name)
+        self.positions.pop(name, None)
+        for tool in tools:
+            self.locations.pop(tool.uid, None)
+        self.record_change("delete_category", name)
+        self.category_removed.emit(name, tools)
+        return True
+
+    def reorder_categories(self, names):
+        new_data = {name: self.data[name] for name in names if name in self.data}
+        for k, v in self.data.items():
+            new_data.setdefault(k, v)
+        self.data = new_data
+        self.record_change("reorder_categories")
+        self.categories_reordered.emit()
+
+    # ---------- 工具 ----------
+    def category_of(self, tool):
+        return self.locations.get(tool.uid)
+
+    def _positions(self, category):
+        positions = self.positions.get(category)
+        if positions is None:
+            positions = self.positions[category] = ToolPositions(self.data[category])
+        return positions
+
+    def insert_tool(self, category, tool, index=None):
+        positions = self._positions(category)
+        index = positions.insert(len(positions) if index is None else index, tool)
+        self.locations[tool.uid] = category
+        self.record_change("add_tool", category, tool)  # 保存时会一并重写该分类的顺序
+        self.tool_inserted.emit(category, index, tool)
+
+    def insert_tools(self, category, tools):
+        """批量追加到分类末尾：只记录一条操作、发出一次信号"""
+        if not tools:
             return
+        self._positions(category).extend(tools)
+        for tool in tools:
+            self.locations[tool.uid] = category
+        self.record_change("add_tools", category, tools)
+        self.tools_added.emit(category, tools)
+
+    def update_tool(self, tool, name, desc, path, url):
+        # 原地修改，保留对象本身 (及其数据库行号)
+        tool.name = name
+        tool.desc = desc
+        tool.path = path
+        tool.url = url
+        self.record_change("edit_tool", tool)
+        self.tool_updated.emit(tool)
+
+    def remove_tool(self, category, tool):
+        if self.locations.get(tool.uid) != category:
+            return False
+        index = self._positions(category).remove(tool)
+        del self.locations[tool.uid]
+        self.record_change("delete_tool", tool)
+        self.tool_removed.emit(category, index, tool)
+        return True
 
-        try:
-            # 1. 确定 save 目录路径 (位于 .res 同级的 save 目录)
-            # self.db_path 是 .../.res/data.db
-            res_dir = os.path.dirname(self.db_path)  # 获取 .res 目录
-            root_dir = os.path.dirname(res_dir)      # 获取 根目录
-            save_dir = os.path.join(root_dir, "save")
-
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
-
-            # 2. 生成带时间戳的备份文件名
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            backup_name = f"data_{timestamp}.db"
-            backup_path = os.path.join(save_dir, backup_name)
-
-            # 3. 复制文件 (备份当前旧版本)
-            shutil.copy2(self.db_path, backup_path)
-            print(f"Backup created: {backup_path}")
-
-            # 4. 清理旧备份 (只保留最新的5个)
-            all_backups = []
-            for f in os.listdir(save_dir):
-                if f.startswith("data_") and f.endswith(".db"):
-                    full_p = os.path.join(save_dir, f)
-                    all_backups.append(full_p)
-            
-            # 按修改时间排序 (最旧的在前)
-            all_backups.sort(key=os.path.getmtime)
-            
-            # 如果超过5个，删除前面的
-            while len(all_backups) > 5:
-                oldest_file = all_backups.pop(0)
-                try:
-                    os.remove(oldest_file)
-                    print(f"Removed old backup: {oldest_file}")
-                except Exception as e:
-                    print(f"Failed to remove old backup: {e}")
+    def move_tool(self, tool, src_category, dst_category, index):
+        """拖拽排序/跨分类移动"""
+        if self.locations.get(tool.uid) == src_category:
+            old_index = self._positions(src_category).remove(tool)
+            self.tool_removed.emit(src_category, old_index, tool)
 
-        except Exception as e:
-            print(f"Backup Process Error: {e}")
+        index = self._positions(dst_category).insert(index, tool)
+        self.locations[tool.uid] = dst_category
+        if dst_category == src_category:
+            self.record_change("reorder_tools", dst_category)
+        else:
+            self.record_change("move_tool", tool, dst_category)
+        self.tool_inserted.emit(dst_category, index, tool)
 
-    def save_snapshot(self, data_dict):
-        """一次性将内存数据覆盖写入数据库"""
-        
-        # 【新增】在写入新数据前，先备份旧数据
-        self.create_backup()
+# ==========================================
+#      搜索索引 (名称前缀 + 分块子串扫描)
+# ==========================================
+class _SearchBlock:
+    """最多 SearchIndex.BLOCK_SIZE 个工具的小写文本，拼成一个字符串供 str.find 扫描"""
+    def __init__(self):
+        self.docs = []        # 文档号，已删除且尚未复用的位置为 None
+        self.name_parts = []  # 每个位置的小写名称
+        self.text_parts = []  # 每个位置的小写 "说明 路径"
+        self.dirty = True
+        self.names = ""
+        self.name_starts = []
+        self.texts = ""
+        self.text_starts = []
+
+    @staticmethod
+    def _pack(parts):
+        starts = []
+        pos = 0
+        for part in parts:
+            starts.append(pos)
+            pos += len(part) + 1
+        return "\n".join(parts), starts
+
+    def put(self, slot, doc, name, tool):
+        """写入一个位置 (slot 等于 len(docs) 时追加)"""
+        text = f"{tool.desc or ''} {tool.path or ''}".lower()
+        if slot == len(self.docs):
+            self.docs.append(doc)
+            self.name_parts.append(name)
+            self.text_parts.append(text)
+        else:
+            self.docs[slot] = doc
+            self.name_parts[slot] = name
+            self.text_parts[slot] = text
+        self.dirty = True
+
+    def clear(self, slot):
+        self.docs[slot] = None
+        self.name_parts[slot] = ""
+        self.text_parts[slot] = ""
+        self.dirty = True
+
+    def pack(self):
+        """文本已按位置保存，重新拼接只是两次 join，不必再读 ToolData"""
+        self.names, self.name_starts = self._pack(self.name_parts)
+        self.texts, self.text_starts = self._pack(self.text_parts)
+        self.dirty = False
+
+
+class SearchIndex:
+    """跨分类的即时搜索索引
+
+    - 名称前缀：有序表 [(小写名称, 文档号)] + 二分查找
+    - 名称/说明/路径包含：每 BLOCK_SIZE 个工具的文本拼成一个字符串，由 str.find 在 C 层扫描；
+      rebuild 时全部拼好，之后的增删改只把所在的块标记为待拼接，下次查询时重新拼接。
+      修改保留原位置，删除留下的空位由之后加入的工具复用。
+    结果按 名称前缀 > 名称包含 > 说明/路径包含 排序。
+    """
+    BLOCK_SIZE = 512
+    MAX_RESULTS = 200
 
-        conn = self.get_connection()
-        try:
-            conn.execute("BEGIN TRANSACTION")
-            conn.execute("DELETE FROM tools")
-            conn.execute("DELETE FROM categories")
-            
-            cat_sort_index = 0
-            for cat_name, tools_list in data_dict.items():
-                cursor = conn.execute("INSERT INTO categories (name, sort_order) VALUES (?, ?)", (cat_name, cat_sort_index))
-                cat_id = cursor.lastrowid
-                cat_sort_index += 1
-                
-                tool_sort_index = 0
-                for tool in tools_list:
-                    conn.execute("""
-                        INSERT INTO tools (category_id, name, description, path, url, sort_order) 
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (cat_id, tool.name, tool.desc, tool.path, tool.url, tool_sort_index))
-                    tool_sort_index += 1
-            
-            conn.commit()
-            return True
-        except Exception as e:
-            conn.rollback()
-            print(f"Save Error: {e}")
-            return False
-        finally:
-            conn.close()
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.tools = {}       # 文档号 -> ToolData
+        self.doc_ids = {}     # ToolData -> 文档号
+        self.names = {}       # 文档号 -> 建索引时的小写名称 (用于从有序表中删除)
+        self.prefix = []      # 有序 [(小写名称, 文档号)]
+        self.prefix_sorted = True
+        self.blocks = []
+        self.locations = {}   # 文档号 -> (块, 块内位置)
+        self.free_slots = []  # 删除后空出的 (块, 块内位置)，加入新工具时优先复用
+        self.next_id = 0
+
+    def rebuild(self, data_dict):
+        self.clear()
+        for tools in data_dict.values():
+            for tool in tools:
+                self._add(tool, keep_sorted=False)
+        self.prefix.sort()
+        # 加载时一次拼好，第一次查询不必再拼接
+        for block in self.blocks:
+            block.pack()
+
+    def add(self, tool):
+        self._sort_prefix()
+        self._add(tool, keep_sorted=True)
+
+    def add_many(self, tools):
+        """批量加入：只追加，下次查询时才整体排序一次 (与块的延迟拼接一样)"""
+        for tool in tools:
+            self._add(tool, keep_sorted=False)
+        self.prefix_sorted = False
+
+    def _sort_prefix(self):
+        if not self.prefix_sorted:
+            self.prefix.sort()
+            self.prefix_sorted = True
+
+    def _remove_prefix(self, name, doc):
+        self._sort_prefix()
+        i = bisect_left(self.prefix, (name, doc))
+        if i < len(self.prefix) and self.prefix[i] == (name, doc):
+            self.prefix.pop(i)
+
+    def update(self, tool):
+        """工具被编辑：原位置改写，不留空位"""
+        doc = self.doc_ids.get(tool)
+        if doc is None:
+            self.add(tool)
+            return
+        name = tool.name.lower()
+        old_name = self.names[doc]
+        if name != old_name:
+            self._remove_prefix(old_name, doc)
+            self.names[doc] = name
+            self.prefix.insert(bisect_left(self.prefix, (name, doc)), (name, doc))
+        block, slot = self.locations[doc]
+        block.put(slot, doc, name, tool)
+
+    def remove(self, tool):
+        doc = self.doc_ids.pop(tool, None)
+        if doc is None:
+            return
+        del self.tools[doc]
+        self._remove_prefix(self.names.pop(doc), doc)
+        block, slot = self.locations.pop(doc)
+        block.clear(slot)
+        self.free_slots.append((block, slot))
+
+    def _add(self, tool, keep_sorted):
+        if tool in self.doc_ids:
+            return
+        doc = self.next_id
+        self.next_id += 1
+        name = tool.name.lower()
+        self.tools[doc] = tool
+        self.doc_ids[tool] = doc
+        self.names[doc] = name
+        if keep_sorted:
+            self.prefix.insert(bisect_left(self.prefix, (name, doc)), (name, doc))
+        else:
+            self.prefix.append((name, doc))
+
+        if self.free_slots:
+            block, slot = self.free_slots.pop()
+        else:
+            if not self.blocks or len(self.blocks[-1].docs) >= self.BLOCK_SIZE:
+                self.blocks.append(_SearchBlock())
+            block = self.blocks[-1]
+            slot = len(block.docs)
+        self.locations[doc] = (block, slot)
+        block.put(slot, doc, name, tool)
+
+    def search(self, query, limit=MAX_RESULTS):
+        q = query.strip().lower()
+        if not q:
+            return []
+        seen = set()
+
+        # 1. 名称前缀
+        self._sort_prefix()
+        prefix_hits = []
+        i = bisect_left(self.prefix, (q,))
+        while i < len(self.prefix) and len(prefix_hits) < limit:
+            name, doc = self.prefix[i]
+            if not name.startswith(q):
+                break
+            prefix_hits.append(doc)
+            seen.add(doc)
+            i += 1
+        results = prefix_hits
+
+        # 2. 名称包含，3. 说明/路径包含 (各层内名称越短越靠前)
+        for use_names in (True, False):
+            if len(results) >= limit:
+                break
+            hits = self._scan(q, use_names, limit - len(results), seen)
+            hits.sort(key=lambda d: len(self.names[d]))
+            results = results + hits
+
+        return [self.tools[doc] for doc in results]
+
+    def _scan(self, q, use_names, limit, seen):
+        hits = []
+        for block in self.blocks:
+            if block.dirty:
+                block.pack()
+            hay, starts = (block.names, block.name_starts) if use_names else (block.texts, block.text_starts)
+            pos = hay.find(q)
+            while pos != -1:
+                k = bisect_right(starts, pos) - 1
+                doc = block.docs[k]
+                if doc is not None and doc not in seen:
+                    seen.add(doc)
+                    hits.append(doc)
+                    if len(hits) >= limit:
+                        return hits
+                # 同一个工具只算一次，直接跳到下一个工具的文本
+                pos = hay.find(q, starts[k + 1]) if k + 1 < len(starts) else -1
+        return hits
 
 # ==========================================
 #      配置加载 (读取 .res/config.ini)
 # ==========================================
+# 节 -> {选项: 默认值}；值的类型由默认值决定，缺失或非法的项回退到默认值并打印警告
+CONFIG_DEFAULTS = {
+    'WINDOW_SETTINGS': {
+        'WINDOW_WIDTH': 1280, 'WINDOW_HEIGHT': 760, 'BG_IMAGE': '.res/bg.png',
+        'SIDEBAR_RATIO': 0.2, 'FONT_FAMILY': 'Microsoft YaHei', 'TEXT_COLOR': '#ffffff',
+    },
+    'FONT_SIZES': {
+        'APP_TITLE': 24, 'VERSION': 10, 'CATEGORY': 15, 'DESCRIPTION': 14, 'TOOL_NAME': 12,
+    },
+    'LAYOUT_GEOMETRY': {
+        'TITLE_X': 0, 'TITLE_Y': 20, 'TITLE_W': 256, 'TITLE_H': 40, 'TITLE_TEXT': 'LLSKY9工具箱',
+        'VERSION_X': 0, 'VERSION_Y': 720, 'VERSION_W': 256, 'VERSION_H': 30, 'VERSION_TEXT': '',
+        'DESC_X': 300, 'DESC_Y': 15, 'DESC_W': 800, 'DESC_H': 30,
+    },
+    'BUTTON_CONTROLS': {
+        'CLOSE_X': 1240, 'CLOSE_Y': 10, 'CLOSE_W': 30, 'CLOSE_H': 30, 'CLOSE_FONT_SIZE': 16,
+        'MIN_X': 1200, 'MIN_Y': 10, 'MIN_W': 30, 'MIN_H': 30, 'MIN_FONT_SIZE': 16,
+    },
+    'ITEM_CONFIG': {
+        'WIDTH': 100, 'HEIGHT': 100, 'ICON_SIZE': 48, 'SPACING_X': 10, 'SPACING_Y': 10,
+        'MOVE_ANIMATION_MS': 0,
+    },
+    'CACHE': {'ICON_CACHE_MB': 64},
+    'DAEMON': {'RESIDENT': False},
+    'DATABASE': {'JOURNAL_MODE': 'WAL'},
+    'HEALTH': {'CHECK_TTL_SECONDS': 300},
+    'BACKUP': {'KEEP_COUNT': 5, 'MAX_AGE_DAYS': 0, 'MAX_TOTAL_MB': 0, 'COMPRESS': False},
+}
+# 数值项的取值范围 (未列出的整数项要求 >= 0)
+CONFIG_RANGES = {
+    ('WINDOW_SETTINGS', 'SIDEBAR_RATIO'): (0.05, 0.9),
+    ('ITEM_CONFIG', 'WIDTH'): (1, None),
+    ('ITEM_CONFIG', 'HEIGHT'): (1, None),
+    ('ITEM_CONFIG', 'ICON_SIZE'): (1, None),
+}
+# 只能取固定几个值的文本项 (比较时不区分大小写)
+CONFIG_CHOICES = {
+    ('DATABASE', 'JOURNAL_MODE'): ("WAL", "DELETE", "TRUNCATE", "PERSIST"),
+}
+# 编译结果缓存：ini 的 mtime/大小不变时直接读取，跳过解析与校验
+CONFIG_CACHE_FILE = os.path.join(".res", "config.cache.json")
+CONFIG_CACHE_FORMAT = 2  # 编译结构或样式模板变化时加一
+
+
+def parse_config_value(raw, default):
+    if isinstance(default, bool):
+        value = configparser.ConfigParser.BOOLEAN_STATES.get(raw.strip().lower())
+        if value is None:
+            raise ValueError(raw)
+        return value
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    return raw
+
+
+def read_config_values(full_config_path):
+    """读取 ini 并按 CONFIG_DEFAULTS 校验，返回 {(节, 选项): 值}"""
+    parser = configparser.ConfigParser()
+    parser.read(full_config_path, encoding='utf-8')
+    values = {}
+    for section, options in CONFIG_DEFAULTS.items():
+        for option, default in options.items():
+            value = default
+            raw = parser.get(section, option, fallback=None)
+            if raw is not None:
+                try:
+                    value = parse_config_value(raw, default)
+                    low, high = CONFIG_RANGES.get((section, option), (0, None))
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        if value < low or (high is not None and value > high):
+                            raise ValueError(raw)
+                    choices = CONFIG_CHOICES.get((section, option))
+                    if choices:
+                        value = value.strip().upper()
+                        if value not in choices:
+                            raise ValueError(raw)
+                except ValueError:
+                    print(f"Config Warning: invalid [{section}] {option} = {raw!r}, using default {default!r}")
+                    value = default
+            values[(section, option)] = value
+    return values
+
+
+def build_styles(cfg):
+    """界面用到的样式表只在配置变化时生成一次，所有控件共用同一个字符串"""
+    font = cfg["FONT_FAMILY"]
+    sizes = cfg["FONT_SIZES"]
+    return {
+        # 应用级样式表：网格中成百上千个控件共用，悬停/拖拽由 ToolItem 的动态属性 state 切换
+        "APP": f"""
+            QWidget#ToolGrid {{ background: transparent; }}
+            QWidget#ToolItem {{ background: transparent; border: none; border-radius: 5px; }}
+            QWidget#ToolItem[state="hover"] {{ background: rgba(255, 255, 255, 40); border: 1px solid rgba(255, 255, 255, 50); }}
+            QWidget#ToolItem[state="dragging"] {{ background: rgba(0, 170, 255, 80); border: 2px solid #00aaff; }}
+            QLabel#ToolIcon {{ background: transparent; border: none; }}
+            QLabel#ToolName {{ color: {cfg['TEXT_COLOR']}; font-size: {sizes['TOOL_NAME']}px; font-family: '{font}'; background: transparent; border: none; }}
+            QLabel#BrokenBadge {{ color: #ff5555; background: rgba(0, 0, 0, 120); border-radius: 8px; font-size: 11px; }}
+            QWidget#GridPlaceholder {{ background-color: rgba(255, 255, 255, 10); border: 2px dashed rgba(255, 255, 255, 50); border-radius: 5px; }}
+        """,
+        "TITLE": f"color: white; font-family: '{font}'; font-size: {sizes['APP_TITLE']}px; font-weight: bold;",
+        "CATEGORY_LIST": f"""
+            QListWidget {{ background: transparent; border: none; outline: 0; }}
+            QListWidget::item {{
+                height: 45px;
+                color: rgba(255,255,255,0.7);
+                font-family: '{font}';
+                font-size: {sizes['CATEGORY']}px;
+                padding-left: 0px; 
+                margin-bottom: 2px;
+                border: none;
+            }}
+            QListWidget::item:hover {{ color: #ffffff; padding-left: 20px; background: rgba(255,255,255,0.1); }}
+            QListWidget::item:selected {{ color: #00aaff; font-weight: bold; background: rgba(255, 255, 255, 30); border-left: 4px solid #00aaff; }}
+        """,
+        "VERSION": f"color: rgba(255,255,255,0.3); font-size: {sizes['VERSION']}px;",
+        "DESCRIPTION": f"color: rgba(255,255,255,0.9); font-family: '{font}'; font-size: {sizes['DESCRIPTION']}px;",
+        "BTN_CLOSE": f"QLabel {{ color: white; font-size: {cfg['BTN_CLOSE']['FONT_SIZE']}px; background: transparent; }} QLabel:hover {{ background-color: rgba(255, 0, 0, 0.3); }}",
+        "BTN_MIN": f"QLabel {{ color: white; font-size: {cfg['BTN_MIN']['FONT_SIZE']}px; background: transparent; }} QLabel:hover {{ background-color: rgba(255, 255, 255, 0.1); }}",
+    }
+
+
+def values_of(values, section):
+    return ((option, values[(section, option)]) for option in CONFIG_DEFAULTS[section])
+
+
+def compile_config(values):
+    """把校验后的配置项整理成 USER_CONFIG 的结构 (可 JSON 序列化)"""
+    def v(section, option):
+        return values[(section, option)]
+
+    def geometry(section, prefix):
+        return [v(section, prefix + "_X"), v(section, prefix + "_Y"), v(section, prefix + "_W"), v(section, prefix + "_H")]
+
+    cfg = {
+        "WINDOW_WIDTH": v('WINDOW_SETTINGS', 'WINDOW_WIDTH'),
+        "WINDOW_HEIGHT": v('WINDOW_SETTINGS', 'WINDOW_HEIGHT'),
+        "BG_IMAGE": v('WINDOW_SETTINGS', 'BG_IMAGE'),
+        "SIDEBAR_RATIO": v('WINDOW_SETTINGS', 'SIDEBAR_RATIO'),
+        "FONT_FAMILY": v('WINDOW_SETTINGS', 'FONT_FAMILY'),
+        "TEXT_COLOR": v('WINDOW_SETTINGS', 'TEXT_COLOR'),
+        "FONT_SIZES": dict(values_of(values, 'FONT_SIZES')),
+        "TITLE_Geometry": geometry('LAYOUT_GEOMETRY', 'TITLE'),
+        "TITLE_TEXT": v('LAYOUT_GEOMETRY', 'TITLE_TEXT'),
+        "VERSION_Geometry": geometry('LAYOUT_GEOMETRY', 'VERSION'),
+        "VERSION_TEXT": v('LAYOUT_GEOMETRY', 'VERSION_TEXT'),
+        "DESC_Geometry": geometry('LAYOUT_GEOMETRY', 'DESC'),
+        "BTN_CLOSE": {"GEOMETRY": geometry('BUTTON_CONTROLS', 'CLOSE'), "TEXT": "",
+                      "FONT_SIZE": v('BUTTON_CONTROLS', 'CLOSE_FONT_SIZE')},
+        "BTN_MIN": {"GEOMETRY": geometry('BUTTON_CONTROLS', 'MIN'), "TEXT": "",
+                    "FONT_SIZE": v('BUTTON_CONTROLS', 'MIN_FONT_SIZE')},
+        "ITEM_CONFIG": dict(values_of(values, 'ITEM_CONFIG')),
+        # 【新增】图标内存缓存上限 (MB)
+        "ICON_CACHE_MB": v('CACHE', 'ICON_CACHE_MB'),
+        "RESIDENT": v('DAEMON', 'RESIDENT'),
+        "BACKUP": dict(values_of(values, 'BACKUP')),
+        "JOURNAL_MODE": v('DATABASE', 'JOURNAL_MODE'),
+        "HEALTH_TTL_SECONDS": v('HEALTH', 'CHECK_TTL_SECONDS'),
+    }
+    cfg["STYLES"] = build_styles(cfg)
+    return cfg
+
+
+def config_cache_tag():
+    return f"{CONFIG_CACHE_FORMAT}:{hashlib.sha1(repr(CONFIG_DEFAULTS).encode('utf-8')).hexdigest()[:12]}"
+
+
+def load_compiled_config(full_config_path, cache_path):
+    """优先使用编译缓存；ini 变化 (mtime/大小) 或默认值表变化时重新解析并写回缓存"""
+    import json
+    st = os.stat(full_config_path)
+    stamp = f"{os.path.abspath(full_config_path)}:{st.st_mtime_ns}:{st.st_size}"
+    tag = config_cache_tag()
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("stamp") == stamp and cached.get("tag") == tag:
+            return cached["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    compiled = compile_config(read_config_values(full_config_path))
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({"stamp": stamp, "tag": tag, "config": compiled}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Config cache not written: {e}")
+    return compiled
+
+
 def load_config(current_dir, config_file=".res/config.ini"):
     global USER_CONFIG
-    parser = configparser.ConfigParser()
     full_config_path = os.path.join(current_dir, config_file)
     try:
         if not os.path.exists(full_config_path):
             print(f"Config not found: {full_config_path}")
             return False 
-        
-        parser.read(full_config_path, encoding='utf-8')
-
-        USER_CONFIG.update({
-            "WINDOW_WIDTH": parser.getint('WINDOW_SETTINGS', 'WINDOW_WIDTH'),
-            "WINDOW_HEIGHT": parser.getint('WINDOW_SETTINGS', 'WINDOW_HEIGHT'),
-            "BG_IMAGE": parser.get('WINDOW_SETTINGS', 'BG_IMAGE'),
-            "SIDEBAR_RATIO": parser.getfloat('WINDOW_SETTINGS', 'SIDEBAR_RATIO'),
-            "FONT_FAMILY": parser.get('WINDOW_SETTINGS', 'FONT_FAMILY'),
-            "TEXT_COLOR": parser.get('WINDOW_SETTINGS', 'TEXT_COLOR'),
-        })
-
-        USER_CONFIG["FONT_SIZES"] = {
-            "APP_TITLE": parser.getint('FONT_SIZES', 'APP_TITLE'),
-            "VERSION": parser.getint('FONT_SIZES', 'VERSION'),
-            "CATEGORY": parser.getint('FONT_SIZES', 'CATEGORY'),
-            "DESCRIPTION": parser.getint('FONT_SIZES', 'DESCRIPTION'),
-            "TOOL_NAME": parser.getint('FONT_SIZES', 'TOOL_NAME'),
-        }
 
-        USER_CONFIG["TITLE_Geometry"] = (
-            parser.getint('LAYOUT_GEOMETRY', 'TITLE_X'), 
-            parser.getint('LAYOUT_GEOMETRY', 'TITLE_Y'), 
-            parser.getint('LAYOUT_GEOMETRY', 'TITLE_W'), 
-            parser.getint('LAYOUT_GEOMETRY', 'TITLE_H')
-        )
-        USER_CONFIG["TITLE_TEXT"] = parser.get('LAYOUT_GEOMETRY', 'TITLE_TEXT')
-
-        USER_CONFIG["VERSION_Geometry"] = (
-            parser.getint('LAYOUT_GEOMETRY', 'VERSION_X'), 
-            parser.getint('LAYOUT_GEOMETRY', 'VERSION_Y'), 
-            parser.getint('LAYOUT_GEOMETRY', 'VERSION_W'), 
-            parser.getint('LAYOUT_GEOMETRY', 'VERSION_H')
-        )
-        USER_CONFIG["VERSION_TEXT"] = parser.get('LAYOUT_GEOMETRY', 'VERSION_TEXT')
-
-        USER_CONFIG["DESC_Geometry"] = (
-            parser.getint('LAYOUT_GEOMETRY', 'DESC_X'), 
-            parser.getint('LAYOUT_GEOMETRY', 'DESC_Y'), 
-            parser.getint('LAYOUT_GEOMETRY', 'DESC_W'), 
-            parser.getint('LAYOUT_GEOMETRY', 'DESC_H')
-        )
+        USER_CONFIG.update(load_compiled_config(full_config_path, os.path.join(current_dir, CONFIG_CACHE_FILE)))
         USER_CONFIG["DESC_ALIGN"] = Qt.AlignCenter 
-
-        USER_CONFIG["BTN_CLOSE"] = {
-            "GEOMETRY": (
-                parser.getint('BUTTON_CONTROLS', 'CLOSE_X'), 
-                parser.getint('BUTTON_CONTROLS', 'CLOSE_Y'), 
-                parser.getint('BUTTON_CONTROLS', 'CLOSE_W'), 
-                parser.getint('BUTTON_CONTROLS', 'CLOSE_H')
-            ), 
-            "TEXT": "", 
-            "FONT_SIZE": parser.getint('BUTTON_CONTROLS', 'CLOSE_FONT_SIZE')
-        }
-        
-        USER_CONFIG["BTN_MIN"] = {
-            "GEOMETRY": (
-                parser.getint('BUTTON_CONTROLS', 'MIN_X'), 
-                parser.getint('BUTTON_CONTROLS', 'MIN_Y'), 
-                parser.getint('BUTTON_CONTROLS', 'MIN_W'), 
-                parser.getint('BUTTON_CONTROLS', 'MIN_H')
-            ), 
-            "TEXT": "", 
-            "FONT_SIZE": parser.getint('BUTTON_CONTROLS', 'MIN_FONT_SIZE')
-        }
-
-        USER_CONFIG["ITEM_CONFIG"] = {
-            "WIDTH": parser.getint('ITEM_CONFIG', 'WIDTH'),
-            "HEIGHT": parser.getint('ITEM_CONFIG', 'HEIGHT'),
-            "ICON_SIZE": parser.getint('ITEM_CONFIG', 'ICON_SIZE'),
-            "SPACING_X": parser.getint('ITEM_CONFIG', 'SPACING_X'),
-            "SPACING_Y": parser.getint('ITEM_CONFIG', 'SPACING_Y'),
-        }
+        ICON_CACHE.set_budget(USER_CONFIG["ICON_CACHE_MB"] * 1024 * 1024)
         return True
     except Exception as e:
         print(f"Config Error: {e}")
         return False
 
+
+class ConfigWatcher(QObject):
+    """监视 config.ini，保存后自动重新加载并通知界面重新应用样式"""
+    changed = pyqtSignal()
+
+    RELOAD_DELAY_MS = 200  # 编辑器保存时可能连续触发多次，合并为一次
+
+    def __init__(self, current_dir, config_file=".res/config.ini", parent=None):
+        super().__init__(parent)
+        self.current_dir = current_dir
+        self.config_file = config_file
+        self.path = os.path.join(current_dir, config_file)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload)
+        self._watch()
+
+    def _watch(self):
+        if os.path.exists(self.path) and self.path not in self.watcher.files():
+            self.watcher.addPath(self.path)
+
+    def _on_file_changed(self, _path):
+        self.reload_timer.start()
+
+    def reload(self):
+        # 以"写新文件再替换"方式保存时，原路径会从监视列表中移除，需要重新加入
+        self._watch()
+        if load_config(self.current_dir, self.config_file):
+            self.changed.emit()
+
 # ==========================================
-#      后台线程：预加载图标
+#      图标磁盘缓存 (.res/icon_cache)
 # ==========================================
-class IconPreloader(QThread):
-    def __init__(self, data_dict, current_dir):
+class IconDiskCache:
+    """把缩放好的图标存为小 PNG，下次启动直接读取而不必重新提取
+
+    缩略图放在按图标尺寸区分的子目录 (.res/icon_cache/48px/) 中，文件名由 源文件路径 + 图标尺寸 决定，
+    PNG 内记录源文件的 mtime/size，源文件变化后旧缩略图自动失效并被覆盖。
+    已不再需要的缩略图 (其他尺寸、已删除或已修改的工具) 由 prune 在加载数据后清理。
+    """
+    def __init__(self, cache_dir, icon_size):
+        self.root_dir = cache_dir
+        self.icon_size = icon_size
+        self.cache_dir = os.path.join(cache_dir, f"{icon_size}px")
+        if not os.path.exists(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except Exception as e:
+                print(f"Error creating directory {self.cache_dir}: {e}")
+
+    def _entry_path(self, source_path):
+        key = f"{os.path.normcase(os.path.abspath(source_path))}|{self.icon_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    @staticmethod
+    def _stamp(source_path):
+        st = os.stat(source_path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def lookup(self, source_path):
+        """返回 (源文件是否存在, 仍然有效的缓存 QImage 或 None)，源文件只 stat 一次"""
+        try:
+            stamp = self._stamp(source_path)
+        except OSError:
+            return False, None
+        # 缓存文件不存在时 QImage 为空，不必另外检查
+        image = QImage(self._entry_path(source_path))
+        if image.isNull() or image.text("source") != stamp:
+            return True, None
+        return True, image
+
+    def load(self, source_path):
+        """返回仍然有效的缓存 QImage，否则返回 None"""
+        return self.lookup(source_path)[1]
+
+    def store(self, source_path, image):
+        try:
+            image = QImage(image)
+            image.setText("source", self._stamp(source_path))
+            entry = self._entry_path(source_path)
+            # 先写临时文件再替换，避免留下写了一半的缓存；
+            # 多个工具可能指向同一文件，临时文件名带上线程号，并发写入时互不覆盖
+            tmp_path = f"{entry}.{threading.get_ident()}.tmp"
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, entry)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception as e:
+            print(f"Icon Cache Error: {e}")
+
+    def prune(self, source_paths):
+        """删除其他图标尺寸的子目录、旧版直接放在 icon_cache 下的缩略图，以及来源不在 source_paths 中的条目
+
+        在后台线程调用；正在写入的临时文件 (.tmp) 不动。返回删除的文件/目录数。
+        """
+        import shutil
+        keep = {os.path.basename(self._entry_path(path)) for path in source_paths}
+        removed = 0
+        try:
+            for name in os.listdir(self.root_dir):
+                path = os.path.join(self.root_dir, name)
+                if path == self.cache_dir:
+                    continue
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+                removed += 1
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".png") and name not in keep:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+        except OSError as e:
+            print(f"Icon Cache Error: {e}")
+        return removed
+
+    def get_image(self, source_path, build):
+        """先查磁盘缓存；未命中时调用 build() 取原图 (QImage)，缩放后写回缓存；源文件不存在时返回 None"""
+        exists, image = self.lookup(source_path)
+        if not exists:
+            return None
+        if image is not None:
+            return image
+        image = build()
+        if image is None or image.isNull():
+            return None
+        scaled = image.scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.store(source_path, scaled)
+        return scaled
+
+# ==========================================
+#      后台图标管线 (线程池中解码 QImage)
+# ==========================================
+class IconJobSignals(QObject):
+    """工作线程 -> GUI 线程的信号 (跨线程时自动排队投递)"""
+    image_ready = pyqtSignal(object, str, QImage)   # 请求键, 图标来源, 图像
+    needs_provider = pyqtSignal(object, str)        # 请求键, 需要提取系统图标的文件
+
+
+class IconJob(QRunnable):
+    """在线程池中加载并缩放单个图标，只使用线程安全的 QImage"""
+    def __init__(self, key, current_dir, disk_cache, default_image, signals):
         super().__init__()
-        self.data_dict = data_dict
+        self.key = key  # (工具名, 路径)
         self.current_dir = current_dir
-        self.icon_size = USER_CONFIG["ITEM_CONFIG"]["ICON_SIZE"]
+        self.disk_cache = disk_cache
+        self.default_image = default_image
+        self.signals = signals
 
     def run(self):
-        for category, tool_objects in self.data_dict.items():
-            for tool in tool_objects:
-                name = tool.name
-                path = tool.path
-                cache_key = path
-                
-                if cache_key in ICON_CACHE: continue
-                pixmap = self._load_single_icon(name, path)
-                if pixmap: ICON_CACHE[cache_key] = pixmap
-
-    def _load_single_icon(self, name, path):
-        # 1. 优先检查 icons 文件夹
-        icon_path_png = os.path.join(self.current_dir, "icons", f"{name}.png")
-        if os.path.exists(icon_path_png):
-            return QPixmap(icon_path_png).scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
-        # 2. Exe提取
-        full_path = os.path.join(self.current_dir, path.lstrip(os.sep))
-        if os.path.exists(full_path):
-            file_info = QFileInfo(full_path)
-            icon = QFileIconProvider().icon(file_info)
-            pixmap_raw = icon.pixmap(self.icon_size, self.icon_size)
-            if not pixmap_raw.isNull():
-                 return pixmap_raw.scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
-        # 3. 默认图标
+        name, path = self.key
+        try:
+            # 1. 优先检查 icons 文件夹 (文件不存在时 get_image 返回 None)
+            icon_path_png = os.path.join(self.current_dir, "icons", f"{name}.png")
+            image = self.disk_cache.get_image(icon_path_png, lambda: QImage(icon_path_png))
+            if image is not None:
+                self.signals.image_ready.emit(self.key, icon_path_png, image)
+                return
+
+            # 2. 系统图标：磁盘缓存未命中时只能回到 GUI 线程用 QFileIconProvider 提取
+            full_path = resolve_tool_path(self.current_dir, path)
+            exists, image = self.disk_cache.lookup(full_path)
+            if exists:
+                if image is not None:
+                    self.signals.image_ready.emit(self.key, full_path, image)
+                else:
+                    self.signals.needs_provider.emit(self.key, full_path)
+                return
+        except Exception as e:
+            print(f"Icon Load Error: {e}")
+
+        # 3. 默认图标 (所有工具共用一个缓存项)
+        self.signals.image_ready.emit(self.key, IconLoader.DEFAULT_SOURCE, self.default_image)
+
+
+class IconStoreJob(QRunnable):
+    """把 GUI 线程提取的系统图标写入磁盘缓存，避免在 GUI 线程写盘"""
+    def __init__(self, disk_cache, source_path, image):
+        super().__init__()
+        self.disk_cache = disk_cache
+        self.source_path = source_path
+        self.image = image
+
+    def run(self):
+        self.disk_cache.store(self.source_path, self.image)
+
+
+class IconCachePruneJob(QRunnable):
+    """加载数据后在后台清理磁盘缓存中用不到的缩略图"""
+    def __init__(self, disk_cache, current_dir, keys):
+        super().__init__()
+        self.disk_cache = disk_cache
+        self.current_dir = current_dir
+        self.keys = keys  # [(工具名, 路径)]，与 IconLoader 的请求键相同
+
+    def run(self):
+        # 每个工具可能的两个图标来源：icons 文件夹中的同名 PNG，或工具文件本身
+        sources = []
+        for name, path in self.keys:
+            sources.append(os.path.join(self.current_dir, "icons", f"{name}.png"))
+            sources.append(resolve_tool_path(self.current_dir, path))
+        removed = self.disk_cache.prune(sources)
+        if removed:
+            print(f"Icon cache: removed {removed} stale entries")
+
+
+class IconLoader(QObject):
+    """图标加载调度器
+
+    工作线程数有上限，排队任务由这里自行调度 (当前分类优先)，
+    结果回到 GUI 线程后才转换成 QPixmap、写入 ICON_CACHE 并设置到 ToolItem 上。
+    请求键为 (工具名, 路径)；解析出的图标来源记录在 self.sources 中，
+    ICON_CACHE 则以 (图标来源, 尺寸) 为键，多个工具共用同一来源时只存一份。
+    """
+    idle = pyqtSignal()  # 排队的图标全部处理完
+
+    PROVIDER_BATCH = 8  # 每个事件循环周期最多用 QFileIconProvider 提取的图标数
+    DEFAULT_SOURCE = ":default"
+
+    def __init__(self, current_dir, disk_cache, parent=None):
+        super().__init__(parent)
+        self.current_dir = current_dir
+        self.disk_cache = disk_cache
+        self.icon_size = USER_CONFIG["ITEM_CONFIG"]["ICON_SIZE"]
+        self.default_image = self._load_default_image()
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+        self.signals = IconJobSignals(self)
+        self.signals.image_ready.connect(self._on_image_ready)
+        self.signals.needs_provider.connect(self._on_needs_provider)
+
+        self.sources = {}         # (工具名, 路径) -> 图标来源
+        self.queued = set()       # 尚未开始的请求键
+        self.urgent = deque()     # 当前分类
+        self.normal = deque()     # 其余分类
+        self.running = set()      # 正在线程池中的请求键
+        self.extracting = set()   # 等待 GUI 线程提取系统图标的请求键
+        self.waiters = {}         # 请求键 -> [ToolItem]，图标就绪后需要更新的控件
+
+        self.icon_provider = None
+        self.provider_queue = deque()
+        self.provider_timer = QTimer(self)
+        self.provider_timer.setInterval(0)
+        self.provider_timer.timeout.connect(self._extract_some)
+
+    def _load_default_image(self):
+        # 尝试在 .res 中寻找默认图标
         default_path = os.path.join(self.current_dir, ".res", "default.png")
         if not os.path.exists(default_path):
             default_path = os.path.join(self.current_dir, "default.png")
-            
-        if os.path.exists(default_path):
-             return QPixmap(default_path).scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        image = QImage(default_path) if os.path.exists(default_path) else QImage()
+        if image.isNull():
+            return image
+        return image.scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    @staticmethod
+    def request_key(tool):
+        return (tool.name, tool.path)
+
+    def _cache_key(self, key):
+        source = self.sources.get(key)
+        return (source, self.icon_size) if source is not None else None
+
+    def lookup(self, tool):
+        """返回已缓存的图标 QPixmap，未缓存时返回 None"""
+        # 来源尚未解析时 cache_key 为 None，同样记为一次未命中
+        return ICON_CACHE.get(self._cache_key(self.request_key(tool)))
+
+    def forget(self, tool):
+        """工具被修改/删除后丢弃其来源记录，下次按新信息重新解析"""
+        self.sources.pop(self.request_key(tool), None)
+
+    def request_item(self, item):
+        """ToolItem 缓存未命中时调用：登记控件并优先加载"""
+        self.waiters.setdefault(self.request_key(item.tool_data), []).append(item)
+        self.request([item.tool_data], urgent=True)
+
+    def request_all(self, data_dict):
+        for tools in data_dict.values():
+            self.request(tools)
+
+    def request(self, tools, urgent=False):
+        for tool in tools:
+            key = self.request_key(tool)
+            if key in self.running or key in self.extracting:
+                continue
+            cache_key = self._cache_key(key)
+            if cache_key and cache_key in ICON_CACHE:
+                continue
+            if urgent:
+                self.urgent.append(key)
+            elif key not in self.queued:
+                self.normal.append(key)
+            self.queued.add(key)
+        self._pump()
+
+    def _pump(self):
+        while len(self.running) < self.pool.maxThreadCount():
+            key = self._next_key()
+            if key is None:
+                return
+            self.queued.discard(key)
+            self.running.add(key)
+            self.pool.start(IconJob(key, self.current_dir, self.disk_cache, self.default_image, self.signals))
+
+    def _next_key(self):
+        for queue in (self.urgent, self.normal):
+            while queue:
+                key = queue.popleft()
+                if key in self.queued:
+                    return key
         return None
 
+    def _store(self, key, source, pixmap):
+        self.sources[key] = source
+        ICON_CACHE.put((source, self.icon_size), pixmap)
+
+    def _on_image_ready(self, key, source, image):
+        self.running.discard(key)
+        if not image.isNull():
+            self._store(key, source, QPixmap.fromImage(image))
+        self._notify(key)
+        self._pump()
+        self._check_idle()
+
+    def is_idle(self):
+        return not (self.queued or self.running or self.extracting)
+
+    def _check_idle(self):
+        if self.is_idle():
+            self.idle.emit()
+
+    def _on_needs_provider(self, key, full_path):
+        self.running.discard(key)
+        self.extracting.add(key)
+        self.provider_queue.append((key, full_path))
+        if not self.provider_timer.isActive():
+            self.provider_timer.start()
+        self._pump()
+
+    def _extract_some(self):
+        """分批在 GUI 线程提取系统图标，避免长时间阻塞界面"""
+        if self.icon_provider is None:
+            self.icon_provider = QFileIconProvider()
+        for _ in range(self.PROVIDER_BATCH):
+            if not self.provider_queue:
+                break
+            key, full_path = self.provider_queue.popleft()
+            self.extracting.discard(key)
+            # 同一文件已被别的工具提取过：直接共用，不再提取和写盘
+            pixmap = ICON_CACHE.peek((full_path, self.icon_size))
+            if pixmap is not None:
+                self._store(key, full_path, pixmap)
+                self._notify(key)
+                continue
+            pixmap = self.icon_provider.icon(QFileInfo(full_path)).pixmap(self.icon_size, self.icon_size)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(self.icon_size, self.icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self._store(key, full_path, pixmap)
+                self.pool.start(IconStoreJob(self.disk_cache, full_path, pixmap.toImage()), -1)
+            elif not self.default_image.isNull():
+                self._store(key, self.DEFAULT_SOURCE, QPixmap.fromImage(self.default_image))
+            self._notify(key)
+        if not self.provider_queue:
+            self.provider_timer.stop()
+            self._check_idle()
+
+    def _notify(self, key):
+        pixmap = ICON_CACHE.peek(self._cache_key(key))
+        for item in self.waiters.pop(key, []):
+            # 控件可能已被销毁或换成别的工具
+            if not sip.isdeleted(item) and self.request_key(item.tool_data) == key:
+                item.set_icon(pixmap)
+
+# ==========================================
+#      文件健康检查：后台扫描失效路径
+# ==========================================
+class HealthCheckSignals(QObject):
+    checked = pyqtSignal(object)  # [(完整路径, 是否存在)]
+
+
+class HealthCheckJob(QRunnable):
+    """在线程池中检查一批路径是否存在"""
+    def __init__(self, paths, signals):
+        super().__init__()
+        self.paths = paths
+        self.signals = signals
+
+    def run(self):
+        self.signals.checked.emit([(path, os.path.exists(path)) for path in self.paths])
+
+
+class PathHealthMonitor(QObject):
+    """后台检查每个工具的文件是否存在
+
+    结果按完整路径缓存 ttl 秒，过期后由定时器重新检查；同时监视工具所在的目录，
+    目录有变化时立即重新检查其中的路径。界面只读缓存 (is_broken)，启动和加载图标时不再 stat。
+    """
+    changed = pyqtSignal(object)  # 状态有变化的完整路径集合
+
+    BATCH_SIZE = 256
+    MAX_THREADS = 8
+    MAX_WATCHED_DIRS = 256  # 监视目录数上限 (系统对 inotify/句柄数有限制)
+
+    def __init__(self, current_dir, ttl_seconds, parent=None):
+        super().__init__(parent)
+        self.current_dir = current_dir
+        self.ttl = ttl_seconds
+        self.status = {}      # 完整路径 -> (是否存在, 检查时间)
+        self.pending = set()  # 正在检查的路径
+        self.paths = {}       # 当前所有工具的完整路径 -> 使用该路径的工具数
+        self.tool_paths = {}  # ToolData.uid -> 登记时的完整路径 (编辑/删除时据此释放旧路径)
+        self.dir_paths = {}   # 被监视的目录 -> {完整路径}
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self.signals = HealthCheckSignals(self)
+        self.signals.checked.connect(self._on_checked)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(max(1, ttl_seconds) * 1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def full_path(self, tool):
+        return resolve_tool_path(self.current_dir, tool.path)
+
+    def is_broken(self, tool):
+        """已确认文件不存在 (未检查过的视为正常)"""
+        return self.is_missing(self.full_path(tool))
+
+    def is_missing(self, full_path):
+        entry = self.status.get(full_path)
+        return entry is not None and not entry[0]
+
+    def track(self, data_dict):
+        """重新加载数据后调用：登记所有工具路径、监视其目录并检查过期的路径"""
+        self.paths = {}
+        self.tool_paths = {}
+        self.dir_paths = {}
+        for tools in data_dict.values():
+            for tool in tools:
+                self._retain(tool, watch=False)
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        watched = list(self.dir_paths)[:self.MAX_WATCHED_DIRS]
+        if watched:
+            self.watcher.addPaths(watched)  # 不存在的目录会被忽略
+        self.check(self.paths)
+        self.refresh_timer.start()
+
+    def add(self, tool):
+        """新增或修改的工具立即检查 (修改了路径时释放旧路径)"""
+        self._release(tool)
+        self.check([self._retain(tool)], force=True)
+
+    def add_found(self, tools):
+        """批量导入时刚扫描到的工具：文件确定存在，直接记入缓存而不再检查"""
+        now = time.monotonic()
+        for tool in tools:
+            self.status[self._retain(tool)] = (True, now)
+
+    def remove(self, tool):
+        """工具被删除：没有其他工具使用的路径不再定期检查"""
+        self._release(tool)
+
+    def _retain(self, tool, watch=True):
+        path = self.full_path(tool)
+        self.tool_paths[tool.uid] = path
+        count = self.paths.get(path, 0)
+        self.paths[path] = count + 1
+        if count == 0:
+            directory = os.path.dirname(path)
+            dir_set = self.dir_paths.get(directory)
+            if dir_set is None:
+                dir_set = self.dir_paths[directory] = set()
+                # 新增/导入的工具所在的新目录也要监视；track 重建时统一批量添加
+                if watch and len(self.watcher.directories()) < self.MAX_WATCHED_DIRS:
+                    self.watcher.addPath(directory)  # 不存在的目录返回 False，忽略即可
+            dir_set.add(path)
+        return path
+
+    def _release(self, tool):
+        path = self.tool_paths.pop(tool.uid, None)
+        if path is None:
+            return
+        count = self.paths.pop(path) - 1
+        if count:
+            self.paths[path] = count
+            return
+        # 检查结果留在缓存里：拖到别的分类 (先删后加) 或撤销时不必等重新检查
+        directory = os.path.dirname(path)
+        dir_set = self.dir_paths.get(directory)
+        if dir_set is not None:
+            dir_set.discard(path)
+            if not dir_set:
+                del self.dir_paths[directory]
+                if directory in self.watcher.directories():
+                    self.watcher.removePath(directory)
+
+    def refresh(self):
+        self.check(self.paths)
+
+    def check(self, paths, force=False):
+        """把过期 (或 force 时全部) 的路径分批交给线程池"""
+        now = time.monotonic()
+        todo = []
+        for path in paths:
+            if path in self.pending:
+                continue
+            entry = self.status.get(path)
+            if force or entry is None or now - entry[1] >= self.ttl:
+                todo.append(path)
+                self.pending.add(path)
+        for i in range(0, len(todo), self.BATCH_SIZE):
+            self.pool.start(HealthCheckJob(todo[i:i + self.BATCH_SIZE], self.signals))
+
+    def mark(self, full_path, exists):
+        """其他途径 (例如启动失败) 得知的结果直接写入缓存"""
+        self._on_checked([(full_path, exists)])
+
+    def _on_checked(self, results):
+        now = time.monotonic()
+        changed = set()
+        for path, exists in results:
+            self.pending.discard(path)
+            old = self.status.get(path)
+            self.status[path] = (exists, now)
+            if (old is None and not exists) or (old is not None and old[0] != exists):
+                changed.add(path)
+        if changed:
+            self.changed.emit(changed)
+
+    def _on_directory_changed(self, directory):
+        self.check(self.dir_paths.get(directory, ()), force=True)
+
+# ==========================================
+#      批量导入：后台流式扫描文件夹
+# ==========================================
+class FolderImportSignals(QObject):
+    batch = pyqtSignal(object, int, int)  # [(分类, [ToolData])], 已扫描目录数, 已找到文件数
+    finished = pyqtSignal(int, bool)      # 跳过的重复文件数, 是否被取消
+
+
+class FolderImportJob(QRunnable):
+    """用 os.scandir 逐个目录扫描，找到的程序按文件夹分组，攒够一批或隔一小段时间交给界面线程
+
+    每个含有程序的文件夹对应一个分类 (名称为相对所选文件夹的路径)，
+    路径与 browse_file 一样保存为相对工具箱目录的路径；已在目录中的文件跳过。
+    """
+    EXTENSIONS = (".exe", ".bat", ".cmd", ".lnk", ".sh", ".appimage")
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.1  # 秒；没找到文件时也按这个间隔报告进度
+    MAX_PENDING = 4 * BATCH_SIZE  # 界面来不及处理时攒到这么多就暂停扫描
+
+    def __init__(self, root, current_dir, existing_paths, signals):
+        super().__init__()
+        self.root = os.path.normpath(root)
+        self.current_dir = current_dir
+        self.existing = existing_paths  # 已有工具的 normcase 完整路径 (本任务独占)
+        self.signals = signals
+        self.cancelled = False
+        # 上一批已被界面处理完 (acknowledge)；同一时间只有一批在事件队列里，界面不会被连续几批卡住
+        self.ready = threading.Event()
+        self.ready.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self.ready.set()
+
+    def acknowledge(self):
+        self.ready.set()
+
+    def _wait_ready(self):
+        while not self.ready.wait(0.1):
+            pass
+
+    def is_program(self, entry):
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext in self.EXTENSIONS:
+            return True
+        # 非 Windows 下没有扩展名的可执行文件
+        if os.name != 'nt' and not ext:
+            try:
+                return bool(entry.stat().st_mode & 0o111)
+            except OSError:
+                return False
+        return False
+
+    def category_name(self, directory, root_name):
+        rel = os.path.relpath(directory, self.root)
+        return root_name if rel == os.curdir else root_name + "/" + rel.replace(os.sep, "/")
+
+    def relative_path(self, full_path):
+        try:
+            return os.path.relpath(full_path, self.current_dir)
+        except ValueError:
+            return full_path  # Windows 下不在同一个盘符，只能保存完整路径
+
+    def run(self):
+        root_name = os.path.basename(self.root) or self.root
+        groups, pending = [], 0
+        dirs_scanned = found = skipped = 0
+        last_emit = time.monotonic()
+        stack = [self.root]
+        while stack and not self.cancelled:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name.lower())
+            except OSError:
+                continue
+            dirs_scanned += 1
+            tools = []
+            subdirs = []
+            for entry in entries:
+                try:
+                    # 不跟随目录链接，避免循环
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file() or not self.is_program(entry):
+                        continue
+                except OSError:
+                    continue
+                key = os.path.normcase(entry.path)
+                if key in self.existing:
+                    skipped += 1
+                    continue
+                self.existing.add(key)
+                tools.append(ToolData(os.path.splitext(entry.name)[0], "", self.relative_path(entry.path), ""))
+            stack.extend(reversed(subdirs))  # 按名称顺序深度优先
+            if tools:
+                groups.append((self.category_name(directory, root_name), tools))
+                pending += len(tools)
+                found += len(tools)
+            if pending >= self.MAX_PENDING:
+                self._wait_ready()
+            now = time.monotonic()
+            if (pending >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL) and self.ready.is_set():
+                self.ready.clear()
+                self.signals.batch.emit(groups, dirs_scanned, found)
+                groups, pending, last_emit = [], 0, now
+        if groups and not self.cancelled:
+            self._wait_ready()
+            self.signals.batch.emit(groups, dirs_scanned, found)
+        self.signals.finished.emit(skipped, self.cancelled)
+
+# ==========================================
+#      启动器：有上限的线程池 + 进程表
+# ==========================================
+class LaunchedProcess:
+    """一次启动的记录 (Windows 下 os.startfile 拿不到句柄，pid 为 None)"""
+    def __init__(self, path, popen, started_at, latency_ms):
+        self.path = path
+        self.popen = popen
+        self.pid = popen.pid if popen else None
+        self.started_at = started_at   # time.time()
+        self.latency_ms = latency_ms   # 从双击到进程创建的耗时
+        self.exit_code = None
+
+
+class AppLauncher(QObject):
+    """在后台线程池中启动软件
+
+    - 工作线程最多 MAX_WORKERS 个，排队中的启动超过 MAX_PENDING 个时直接拒绝，
+      同一文件正在启动时忽略重复请求，防止连续双击造成启动风暴
+    - 结果通过信号回到 GUI 线程 (跨线程自动排队投递)
+    - 记录启动的 Popen 句柄，定时 poll 取得退出码并回收，不留僵尸进程
+    """
+    launched = pyqtSignal(object)      # LaunchedProcess
+    failed = pyqtSignal(str, str)      # 路径, 错误信息
+    missing = pyqtSignal(str)          # 文件不存在的路径
+
+    MAX_WORKERS = 2
+    MAX_PENDING = 8
+    REAP_INTERVAL_MS = 2000
+    HISTORY_SIZE = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = None  # 第一次启动时再创建
+        self.lock = threading.Lock()
+        self.pending = set()                          # 正在启动的路径
+        self.running = {}                             # pid -> LaunchedProcess
+        self.history = deque(maxlen=self.HISTORY_SIZE)  # 已启动 (含已退出) 的记录
+
+        self.reap_timer = QTimer(self)
+        self.reap_timer.setInterval(self.REAP_INTERVAL_MS)
+        self.reap_timer.timeout.connect(self.reap)
+        self.launched.connect(self._on_launched)
+
+    def launch(self, full_path, clicked_at=None):
+        """提交一次启动；被限流时返回 False"""
+        if clicked_at is None:
+            clicked_at = time.perf_counter()
+        with self.lock:
+            if full_path in self.pending or len(self.pending) >= self.MAX_PENDING:
+                return False
+            self.pending.add(full_path)
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="launcher")
+        self.executor.submit(self._spawn, full_path, clicked_at)
+        return True
+
+    def _spawn(self, full_path, clicked_at):
+        # 运行在工作线程中，不能直接操作界面
+        try:
+            popen = spawn_tool(full_path)
+            latency_ms = (time.perf_counter() - clicked_at) * 1000
+            self.launched.emit(LaunchedProcess(full_path, popen, time.time(), latency_ms))
+        except FileNotFoundError:
+            self.missing.emit(full_path)
+        except Exception as e:
+            self.failed.emit(full_path, str(e))
+        finally:
+            with self.lock:
+                self.pending.discard(full_path)
+
+    def _on_launched(self, record):
+        self.history.append(record)
+        if record.popen is not None:
+            self.running[record.pid] = record
+            if not self.reap_timer.isActive():
+                self.reap_timer.start()
+
+    def reap(self):
+        """回收已经退出的子进程，记录退出码"""
+        for pid, record in list(self.running.items()):
+            code = record.popen.poll()
+            if code is not None:
+                record.exit_code = code
+                record.popen = None
+                del self.running[pid]
+        if not self.running:
+            self.reap_timer.stop()
+
+    def latency_stats(self):
+        """最近启动的 (次数, 平均毫秒, 最大毫秒)"""
+        latencies = [r.latency_ms for r in self.history]
+        if not latencies:
+            return 0, 0.0, 0.0
+        return len(latencies), sum(latencies) / len(latencies), max(latencies)
+
+# ==========================================
+#      单实例：本地套接字通信
+# ==========================================
+class InstanceServer(QObject):
+    """常驻实例监听本地套接字，每行一条命令：show / run <工具名> / quit"""
+    message_received = pyqtSignal(str)
+
+    def __init__(self, server_name, parent=None):
+        super().__init__(parent)
+        self.server_name = server_name
+        self.server = None  # 开始监听时才导入 QtNetwork
+        self.buffers = {}
+
+    def listen(self):
+        from PyQt5.QtNetwork import QLocalServer
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        if self.server.listen(self.server_name):
+            return True
+        # 上次异常退出可能残留套接字文件 (此时已确认没有实例在运行)
+        self.server.removeServer(self.server_name)
+        if self.server.listen(self.server_name):
+            return True
+        print(f"Instance server failed: {self.server.errorString()}")
+        return False
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._read(s))
+            socket.disconnected.connect(lambda s=socket: self._close(s))
+
+    def _read(self, socket):
+        self.buffers[socket] += bytes(socket.readAll())
+        *lines, self.buffers[socket] = self.buffers[socket].split(b"\n")
+        for line in lines:
+            message = line.decode('utf-8', 'replace').strip()
+            if message:
+                self.message_received.emit(message)
+
+    def _close(self, socket):
+        self._read(socket)
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
+
 # ==========================================
 #      UI组件：占位符
 # ==========================================
 class GridPlaceholder(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("GridPlaceholder")  # 样式见 STYLES["APP"]
+        self.apply_config()
+        self.show()
+
+    def apply_config(self):
         cfg = USER_CONFIG["ITEM_CONFIG"]
         self.setFixedSize(cfg["WIDTH"], cfg["HEIGHT"])
-        self.setStyleSheet("background-color: rgba(255, 255, 255, 10); border: 2px dashed rgba(255, 255, 255, 50); border-radius: 5px;")
-        self.show()
 
 # ==========================================
 #      UI组件：流式布局容器
 # ==========================================
 class ResponsiveContainer(QWidget):
+    """虚拟化的流式网格
+
+    self.slots 按顺序保存当前分类的 ToolData，拖拽时的占位框不在其中，只记下它所在的格子
+    self.placeholder_index (第 i 个格子见 _cells)。只有视口及上下 OVERSCAN_ROWS 行内的格子
+    才会绑定 ToolItem；离开可视范围或切换分类时控件被隐藏放入 self.pool 并保持原来的绑定，
+    再次显示同一工具 (切回最近看过的分类、滚回来) 时直接取回，否则换绑最久未用的控件。
+    批量修改请放在 begin_update()/end_update() 之间，结束时只排版一次。
+    """
+    OVERSCAN_ROWS = 2
+    RESIZE_DELAY_MS = 16  # 连续 resize 合并为一次排版
+    DRAG_FRAME_MS = 16    # 拖拽时鼠标事件合并，每帧最多移动一次占位框
+    RECENT_SCREENS = 3    # 控件总数上限 = 一屏格子数 x 该值，约等于保留最近几个分类的控件
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.tools = [] 
+        self.slots = []
+        self.positions = ToolPositions(self.slots)  # 增删 slots 都经过它，按 uid 找下标
+        self.widgets = {}  # ToolData -> 正在显示的 ToolItem
+        self.pool = OrderedDict()  # ToolData -> 隐藏但仍绑定着它的 ToolItem，按最近使用排序
+        self.page_cells = 0        # 一屏 (含预留行) 的格子数
         self.parent_win = None
         self.placeholder = None 
+        self.placeholder_index = None  # 占位框所在的格子，不拖拽时为 None
+        self.update_depth = 0
+        self.animations = {}  # 控件 -> 移动动画 (MOVE_ANIMATION_MS > 0 时才创建)
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(self.RESIZE_DELAY_MS)
+        self.resize_timer.timeout.connect(self.update_layout)
+
+        self.drag_pos = None
+        self.drag_timer = QTimer(self)
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.setInterval(self.DRAG_FRAME_MS)
+        self.drag_timer.timeout.connect(self.flush_drag)
 
     def set_window_instance(self, win):
         self.parent_win = win
 
-    def add_tool(self, tool_btn):
-        tool_btn.setParent(self)
-        tool_btn.show()
-        self.tools.append(tool_btn)
+    def begin_update(self):
+        """开始批量修改：暂停重绘与排版"""
+        self.update_depth += 1
+        if self.update_depth == 1:
+            self.setUpdatesEnabled(False)
+
+    def end_update(self):
+        """结束批量修改：统一排版一次"""
+        self.update_depth -= 1
+        if self.update_depth == 0:
+            self.update_layout()
+            self.setUpdatesEnabled(True)
+
+    def add_tool(self, tool_data):
+        self.positions.extend((tool_data,))
         self.update_layout() 
 
+    def add_tools(self, tools):
+        self.begin_update()
+        self.positions.extend(tools)
+        self.end_update()
+
+    def insert_tool(self, index, tool_data):
+        index = self.positions.insert(index, tool_data)
+        if self.placeholder_index is not None and index < self.placeholder_index:
+            self.placeholder_index += 1
+        self.update_layout()
+
+    def remove_tool(self, tool_data):
+        # 拖拽中的工具已经被 take_item 取出，不在 slots 里
+        index = self.positions.remove(tool_data)
+        if index is None:
+            return
+        if tool_data in self.widgets:
+            self._release_widget(tool_data)
+        if self.placeholder_index is not None and index < self.placeholder_index:
+            self.placeholder_index -= 1
+        self.update_layout()
+
+    def refresh_tool(self, tool_data):
+        """工具信息变化：只重新绑定它自己的控件 (没有控件则无需处理)"""
+        btn = self.widgets.get(tool_data) or self.pool.get(tool_data)
+        if btn is not None:
+            btn.bind(tool_data)
+
     def clear_tools(self):
-        self.placeholder = None
-        for btn in self.tools:
-            btn.hide()
-            btn.setParent(None)
-            btn.deleteLater()
-        self.tools = []
+        self.remove_placeholder()
+        for tool_data in list(self.widgets):
+            self._release_widget(tool_data)
+        self.slots = []
+        self.positions = ToolPositions(self.slots)
+
+    def take_item(self, item):
+        """拖拽开始时把控件从网格中取出 (不销毁)，返回它原来的位置"""
+        index = self.positions.remove(item.tool_data)
+        if index is None:
+            index = -1
+        if self.widgets.get(item.tool_data) is item:
+            del self.widgets[item.tool_data]
+        self._drop_animation(item)
+        return index
+
+    def _acquire_widget(self, tool_data):
+        btn = self.widgets.get(tool_data)
+        if btn is None:
+            btn = self.pool.pop(tool_data, None)
+            if btn is not None:
+                # 最近显示过，仍绑定着这个工具：只需恢复状态
+                btn.set_state("")
+                btn.update_health()
+            elif self.pool and len(self.widgets) + len(self.pool) >= self.page_cells * self.RECENT_SCREENS:
+                btn = self.pool.popitem(last=False)[1]
+                btn.bind(tool_data)
+            else:
+                # 直接以容器为父控件创建，避免 setParent 触发的重新 polish
+                btn = ToolItem(tool_data, self.parent_win, self)
+            self.widgets[tool_data] = btn
+        return btn
+
+    def _release_widget(self, tool_data):
+        btn = self.widgets.pop(tool_data)
+        self._stop_animation(btn)
+        btn.hide()
+        self.pool[tool_data] = btn
+
+    def apply_config(self):
+        """配置热重载：重新设置所有已创建控件 (含池中的) 的尺寸与样式，再重新排版"""
+        for item in list(self.widgets.values()) + list(self.pool.values()):
+            item.apply_config()
+        if self.placeholder:
+            self.placeholder.apply_config()
+        self.update_layout()
 
     def resizeEvent(self, event):
-        self.update_layout()
+        self.resize_timer.start()
         super().resizeEvent(event)
 
+    def on_scrolled(self, _value=None):
+        self.update_layout()
+
     def get_layout_params(self):
         container_width = self.width()
         cfg = USER_CONFIG["ITEM_CONFIG"]
@@ -365,18 +1767,104 @@ class ResponsiveContainer(QWidget):
         start_x = (container_width - actual_grid_width) // 2
         return w, h, sx, sy, cols, start_x
 
+    def cell_count(self):
+        return len(self.slots) + (self.placeholder_index is not None)
+
+    def _cells(self, first, last):
+        """格子 [first, last) 中显示的内容：ToolData，占位框为 None"""
+        p = self.placeholder_index
+        if p is None or p >= last:
+            return self.slots[first:last]
+        if p < first:
+            return self.slots[first - 1:last - 1]
+        return self.slots[first:p] + [None] + self.slots[p:last - 1]
+
+    def visible_index_range(self, cols, row_h):
+        """视口 (含预留行) 覆盖的格子下标范围 [first, last)"""
+        viewport = self.parentWidget()
+        if viewport is None:
+            return 0, self.cell_count()
+        top = -self.y()
+        first_row = max(0, (top - 10) // row_h - self.OVERSCAN_ROWS)
+        last_row = (top + viewport.height() - 10) // row_h + self.OVERSCAN_ROWS
+        return first_row * cols, min(self.cell_count(), (last_row + 1) * cols)
+
     def update_layout(self):
-        if not self.tools: 
+        if self.update_depth:
+            return  # 批量修改中，由 end_update 统一排版
+        self.resize_timer.stop()
+        count = self.cell_count()
+        if not count: 
             self.setMinimumHeight(20)
             return
-        w, h, sx, sy, cols, start_x = self.get_layout_params()
-        for i, item in enumerate(self.tools):
+        params = self.get_layout_params()
+        w, h, sx, sy, cols, start_x = params
+        total_rows = (count - 1) // cols + 1
+        self.setMinimumHeight(20 + total_rows * (h + sy))
+
+        first, last = self.visible_index_range(cols, h + sy)
+        self.page_cells = max(self.page_cells, last - first)
+        visible = self._cells(first, last)
+
+        # 回收已经离开可视范围的控件
+        visible_set = set(visible)
+        for tool_data in [t for t in self.widgets if t not in visible_set]:
+            self._release_widget(tool_data)
+
+        if self.placeholder and None not in visible_set:
+            self._stop_animation(self.placeholder)
+            self.placeholder.hide()
+
+        self._place(first, visible, params)
+
+    def _place(self, first, cells, params, animate=False):
+        """把从 first 开始的一段格子放到各自的位置"""
+        w, h, sx, sy, cols, start_x = params
+        duration = USER_CONFIG["ITEM_CONFIG"]["MOVE_ANIMATION_MS"] if animate else 0
+        for offset, slot in enumerate(cells):
+            i = first + offset
             row = i // cols
             col = i % cols
-            item.move(int(start_x + col * (w + sx)), int(10 + row * (h + sy)))
-            item.show()
-        total_rows = (len(self.tools) - 1) // cols + 1
-        self.setMinimumHeight(20 + total_rows * (h + sy))
+            item = self.placeholder if slot is None else self._acquire_widget(slot)
+            pos = QPoint(int(start_x + col * (w + sx)), int(10 + row * (h + sy)))
+            if item.isHidden():
+                item.move(pos)  # 刚出现的控件直接就位，不做动画
+                item.show()
+            elif duration:
+                self._animate_to(item, pos, duration)
+            else:
+                self._stop_animation(item)
+                if item.pos() != pos:
+                    item.move(pos)
+
+    def _animate_to(self, item, pos, duration):
+        anim = self.animations.get(item)
+        if anim is None:
+            anim = QPropertyAnimation(item, b"pos", self)
+            anim.setEasingCurve(QEasingCurve.OutCubic)
+            self.animations[item] = anim
+        elif anim.state() == QPropertyAnimation.Running:
+            if anim.endValue() == pos:
+                return
+            anim.stop()
+        if item.pos() == pos:
+            return
+        anim.setDuration(duration)
+        anim.setStartValue(item.pos())
+        anim.setEndValue(pos)
+        anim.start()
+
+    def _stop_animation(self, item):
+        anim = self.animations.get(item)
+        if anim is not None and anim.state() == QPropertyAnimation.Running:
+            anim.stop()
+
+    def _drop_animation(self, item):
+        """控件离开网格 (被拖起或销毁)：停止并删除它的动画，动画挂在容器下，不会随控件释放"""
+        anim = self.animations.pop(item, None)
+        if anim is not None:
+            anim.stop()
+            anim.deleteLater()
 
     def get_index_at_pos(self, pos):
         w, h, sx, sy, cols, start_x = self.get_layout_params()
@@ -390,52 +1878,72 @@ class ResponsiveContainer(QWidget):
         return int(row * cols + col)
 
     def add_placeholder_at_index(self, index=-1):
-        if self.placeholder and self.placeholder in self.tools: return 
-        self.placeholder = GridPlaceholder(self)
-        if index == -1 or index >= len(self.tools): self.tools.append(self.placeholder)
-        else: self.tools.insert(index, self.placeholder)
+        if self.placeholder_index is not None: return 
+        if self.placeholder is None:
+            self.placeholder = GridPlaceholder(self)
+        if index == -1 or index >= len(self.slots): index = len(self.slots)
+        self.placeholder_index = index
         self.update_layout()
 
     def update_placeholder_position(self, global_mouse_pos):
-        if not self.placeholder:
+        """鼠标移动时调用：只记下位置，每帧最多处理一次"""
+        if self.placeholder_index is None:
             self.add_placeholder_at_index()
             return
-        local_pos = self.mapFromGlobal(global_mouse_pos)
-        target_index = self.get_index_at_pos(local_pos)
-        try: current_index = self.tools.index(self.placeholder)
-        except ValueError: 
-            self.add_placeholder_at_index()
+        self.drag_pos = global_mouse_pos
+        if not self.drag_timer.isActive():
+            self.drag_timer.start()
+
+    def flush_drag(self):
+        """把最近一次记下的鼠标位置应用到占位框"""
+        self.drag_timer.stop()
+        if self.drag_pos is None or self.placeholder_index is None:
+            return
+        target_index = self.get_index_at_pos(self.mapFromGlobal(self.drag_pos))
+        self.drag_pos = None
+        self.move_placeholder(min(target_index, len(self.slots)))
+
+    def move_placeholder(self, target_index):
+        """移动占位框：只有新旧位置之间的格子需要挪动"""
+        old_index = self.placeholder_index
+        if old_index is None or old_index == target_index:
+            return
+        self.placeholder_index = target_index
+        if self.update_depth:
             return
-        if target_index >= len(self.tools): target_index = len(self.tools) - 1
-        if current_index != target_index:
-            self.tools.pop(current_index)
-            self.tools.insert(target_index, self.placeholder)
+        params = self.get_layout_params()
+        first, last = self.visible_index_range(params[4], params[1] + params[3])
+        if not (first <= old_index < last and first <= target_index < last):
+            # 有工具进出可视范围，走完整排版
             self.update_layout()
+            return
+        lo, hi = min(old_index, target_index), max(old_index, target_index) + 1
+        self._place(lo, self._cells(lo, hi), params, animate=True)
 
     def remove_placeholder(self):
-        if self.placeholder and self.placeholder in self.tools:
-            self.tools.remove(self.placeholder)
+        self.drag_timer.stop()
+        self.drag_pos = None
+        self.placeholder_index = None
+        if self.placeholder:
+            self._drop_animation(self.placeholder)
             self.placeholder.hide()
             self.placeholder.deleteLater()
             self.placeholder = None
             self.update_layout()
             
     def get_placeholder_index(self):
-        if self.placeholder and self.placeholder in self.tools:
-            return self.tools.index(self.placeholder)
-        return len(self.tools)
+        self.flush_drag()  # 松开鼠标前最后一次移动可能还没处理
+        if self.placeholder_index is not None:
+            return self.placeholder_index
+        return len(self.slots)
 
 # ==========================================
 #      UI组件：单个软件图标
 # ==========================================
 class ToolItem(QWidget):
-    def __init__(self, tool_data, parent_win):
-        super().__init__()
-        self.tool_data = tool_data
-        self.name = tool_data.name
-        self.desc = tool_data.desc
-        self.path = tool_data.path
-        self.url = tool_data.url
+    def __init__(self, tool_data, parent_win, parent=None):
+        super().__init__(parent)
+        self.tool_data = tool_data  # 名称/路径等直接读 tool_data，不再各复制一份
         
         self.parent_win = parent_win
         self.last_left_click = 0
@@ -444,84 +1952,108 @@ class ToolItem(QWidget):
         self.is_dragging = False
         self.original_category = None 
         
-        cfg = USER_CONFIG["ITEM_CONFIG"]
-        self.setFixedSize(cfg["WIDTH"], cfg["HEIGHT"])
         self.setCursor(Qt.PointingHandCursor)
         self.setAttribute(Qt.WA_StyledBackground, True)
-
-        self.style_normal = "QWidget#ToolItem { background: transparent; border: none; border-radius: 5px; }"
-        self.style_hover = "QWidget#ToolItem { background: rgba(255, 255, 255, 40); border: 1px solid rgba(255, 255, 255, 50); border-radius: 5px; }"
-        self.style_dragging = "QWidget#ToolItem { background: rgba(0, 170, 255, 80); border: 2px solid #00aaff; border-radius: 5px; }"
-
-        self.setObjectName("ToolItem")
-        self.setStyleSheet(self.style_normal)
+        self.setObjectName("ToolItem")  # 样式见 STYLES["APP"]，按 state 属性区分常态/悬停/拖拽
+        self.state = ""
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 5, 0, 0)
         layout.setSpacing(2)
 
         self.icon_label = QLabel(self)
-        self.icon_label.setFixedSize(cfg["ICON_SIZE"], cfg["ICON_SIZE"])
+        self.icon_label.setObjectName("ToolIcon")
         self.icon_label.setAlignment(Qt.AlignCenter)
-        self.icon_label.setStyleSheet("background: transparent; border: none;")
         
-        self.text_label = QLabel(self.name, self)
+        self.text_label = QLabel(tool_data.name, self)
+        self.text_label.setObjectName("ToolName")
         self.text_label.setAlignment(Qt.AlignCenter)
         self.text_label.setWordWrap(True)
-        f_size = USER_CONFIG["FONT_SIZES"]["TOOL_NAME"]
-        self.text_label.setStyleSheet(f"color: {USER_CONFIG['TEXT_COLOR']}; font-size: {f_size}px; font-family: '{USER_CONFIG['FONT_FAMILY']}'; background: transparent; border: none;")
 
         layout.addWidget(self.icon_label, 0, Qt.AlignHCenter)
         layout.addWidget(self.text_label, 0, Qt.AlignHCenter)
+        self.broken_badge = None  # 文件不存在时才创建
+        self.apply_config()
+        self.load_icon()
+        self.update_health()
+
+    def apply_config(self):
+        """按 USER_CONFIG 设置尺寸与样式 (配置热重载时对已有控件再次调用)"""
+        cfg = USER_CONFIG["ITEM_CONFIG"]
+        self.setFixedSize(cfg["WIDTH"], cfg["HEIGHT"])
+        # 图标尺寸按启动时的值：已加载的图标和磁盘缓存都是这个尺寸，修改后需要重启
+        icon_size = self.parent_win.icon_loader.icon_size
+        self.icon_label.setFixedSize(icon_size, icon_size)
+        if self.broken_badge is not None:
+            self.broken_badge.move(self.width() - 18, 2)
+
+    def bind(self, tool_data):
+        """复用控件：改为显示另一个工具，而不是销毁重建"""
+        self.tool_data = tool_data  # 名称/路径等直接读 tool_data，不再各复制一份
+        self.drag_start_pos = None
+        self.is_dragging = False
+        self.original_category = None
+        self.set_state("")
+        self.text_label.setText(tool_data.name)
+        self.icon_label.clear()
         self.load_icon()
+        self.update_health()
+
+    def update_health(self):
+        """按后台扫描结果显示/隐藏失效标记"""
+        broken = self.parent_win.health.is_broken(self.tool_data)
+        if broken and self.broken_badge is None:
+            self.broken_badge = QLabel("⚠", self)
+            self.broken_badge.setObjectName("BrokenBadge")
+            self.broken_badge.setAlignment(Qt.AlignCenter)
+            self.broken_badge.setToolTip("文件不存在")
+            self.broken_badge.resize(16, 16)
+        if self.broken_badge is not None:
+            self.broken_badge.move(self.width() - 18, 2)
+            self.broken_badge.setVisible(broken)
+
+    def set_state(self, state):
+        """切换 常态 "" / 悬停 "hover" / 拖拽 "dragging"
+
+        样式表已在应用级解析好，这里只改属性并重新 polish 控件本身；
+        逐个 setStyleSheet 则每次都要重新解析并 polish 整棵子控件树。
+        """
+        if state == self.state:
+            return
+        self.state = state
+        self.setProperty("state", state)
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+        self.update()
 
     def load_icon(self):
-        cache_key = self.path
-        if cache_key in ICON_CACHE:
-            self.icon_label.setPixmap(ICON_CACHE[cache_key])
+        pixmap = self.parent_win.icon_loader.lookup(self.tool_data)
+        if pixmap is not None:
+            self.icon_label.setPixmap(pixmap)
             return
-        
-        current_dir = self.parent_win.current_dir
-        icon_size = USER_CONFIG["ITEM_CONFIG"]["ICON_SIZE"]
-        pixmap = None
-        
-        icon_path_png = os.path.join(current_dir, "icons", f"{self.name}.png")
-        if os.path.exists(icon_path_png):
-            pixmap = QPixmap(icon_path_png)
-        
-        if not pixmap or pixmap.isNull():
-            full_path = os.path.join(current_dir, self.path.lstrip(os.sep))
-            if os.path.exists(full_path):
-                file_info = QFileInfo(full_path)
-                icon = QFileIconProvider().icon(file_info)
-                pixmap = icon.pixmap(icon_size, icon_size)
-
-        if not pixmap or pixmap.isNull():
-            # 尝试在 .res 中寻找默认图标
-            default_path = os.path.join(current_dir, ".res", "default.png")
-            if not os.path.exists(default_path):
-                default_path = os.path.join(current_dir, "default.png")
-            
-            if os.path.exists(default_path):
-                pixmap = QPixmap(default_path)
+        # 交给后台管线，加载完成后回调 set_icon
+        self.parent_win.icon_loader.request_item(self)
 
+    def set_icon(self, pixmap):
         if pixmap and not pixmap.isNull():
-            scaled = pixmap.scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.icon_label.setPixmap(scaled)
-            ICON_CACHE[cache_key] = scaled
+            self.icon_label.setPixmap(pixmap)
         else:
             self.icon_label.setText("?")
 
     def enterEvent(self, event):
         if not self.is_dragging:
-            self.setStyleSheet(self.style_hover)
-            text = f"{self.name} : {self.desc}" if self.desc else self.name
+            self.set_state("hover")
+            tool = self.tool_data
+            text = f"{tool.name} : {tool.desc}" if tool.desc else tool.name
+            if self.broken_badge is not None and self.broken_badge.isVisible():
+                text += " (文件不存在)"
             self.parent_win.update_description(text)
         super().enterEvent(event)
 
     def leaveEvent(self, event):
         if not self.is_dragging:
-            self.setStyleSheet(self.style_normal)
+            self.set_state("")
             self.parent_win.update_description("") 
         super().leaveEvent(event)
 
@@ -541,19 +2073,17 @@ class ToolItem(QWidget):
     def mouseMoveEvent(self, event):
         if not (event.buttons() & Qt.LeftButton): return
         if not self.drag_start_pos: return
+        if self.parent_win.search_results is not None: return  # 搜索结果不是分类，不支持拖拽排序
 
         dist = (event.globalPos() - self.drag_start_pos).manhattanLength()
         
         if not self.is_dragging and dist > 10:
             self.is_dragging = True
-            self.setStyleSheet(self.style_dragging)
+            self.set_state("dragging")
             self.parent_win.dragging_tool_data = self.tool_data 
             
             container = self.parent_win.responsive_container
-            current_index = -1
-            if self in container.tools:
-                current_index = container.tools.index(self)
-                container.tools.remove(self) 
+            current_index = container.take_item(self)
             
             global_pos = self.mapToGlobal(QPoint(0, 0))
             self.setParent(self.parent_win) 
@@ -571,17 +2101,19 @@ class ToolItem(QWidget):
             
             local_sb_pos = sidebar_list.mapFromGlobal(event.globalPos())
             hovered_cat = sidebar_list.itemAt(local_sb_pos)
-            if hovered_cat and hovered_cat != sidebar_list.currentItem():
-                sidebar_list.setCurrentItem(hovered_cat) 
-                container.add_placeholder_at_index()
+            if hovered_cat is sidebar_list.currentItem():
+                hovered_cat = None
+            self.parent_win.hover_category_while_dragging(hovered_cat)
 
             container.update_placeholder_position(event.globalPos())
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
             if self.is_dragging:
+                # 在侧边栏分类上松开：不等停留计时，直接放进该分类
+                self.parent_win.switch_to_hovered_category()
                 self.is_dragging = False
-                self.setStyleSheet(self.style_hover) 
+                self.set_state("hover")
                 self.parent_win.dragging_tool_data = None
                 
                 container = self.parent_win.responsive_container
@@ -591,29 +2123,15 @@ class ToolItem(QWidget):
                     target_category = final_cat_item.text()
                     target_index = container.get_placeholder_index()
                     container.remove_placeholder()
-                    
-                    if self.original_category and self.original_category in self.parent_win.data:
-                         old_list = self.parent_win.data[self.original_category]
-                         if self.tool_data in old_list:
-                             old_list.remove(self.tool_data)
-                    
-                    if target_category not in self.parent_win.data:
-                        self.parent_win.data[target_category] = []
-                    
-                    new_list = self.parent_win.data[target_category]
-                    if target_index >= len(new_list):
-                        new_list.append(self.tool_data)
-                    else:
-                        new_list.insert(target_index, self.tool_data)
-                    
-                    self.parent_win.is_dirty = True
-                    self.parent_win.refresh_ui_from_memory()
+                    # 网格通过 catalog 的变更信号插入该工具
+                    self.parent_win.catalog.move_tool(
+                        self.tool_data, self.original_category, target_category, target_index)
                     
                 self.deleteLater()
             else:
                 current_time = time.time() * 1000
                 if current_time - self.last_left_click < self.click_interval:
-                    self.parent_win.launch_app(self.path)
+                    self.parent_win.launch_app(self.tool_data.path, time.perf_counter())
                 
         self.drag_start_pos = None
 
@@ -696,22 +2214,113 @@ class AddEditSoftwareDialog(QDialog):
         self.result_data = ToolData(name, desc, path, url)
         self.accept()
 
+# ==========================================
+#      窗口背景 (预缩放图缓存 + 圆角成品)
+# ==========================================
+class WindowBackground:
+    """缩放、圆角裁剪只在启动时做一次，得到一张与窗口同尺寸、四角透明的 QPixmap
+
+    缩放好的背景图存为 .res/bg_cache/<key>.bmp (不压缩，读取只需几毫秒)，
+    key 由 图片路径 + mtime/size + 窗口尺寸 决定，图片或窗口尺寸变化后重新生成。
+    """
+    FALLBACK_COLOR = "#2b2b2b"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, image_path, width, height):
+        st = os.stat(image_path)
+        key = f"{os.path.normcase(os.path.abspath(image_path))}|{st.st_mtime_ns}:{st.st_size}|{width}x{height}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bmp")
+
+    def load_scaled(self, image_path, width, height):
+        """返回铺满窗口的背景 QImage，图片不存在或无法读取时返回 None"""
+        try:
+            entry = self._entry_path(image_path, width, height)
+        except OSError:
+            return None
+        # 缓存文件不存在时 QImage 为空，不必另外检查
+        image = QImage(entry)
+        if not image.isNull():
+            return image
+        image = QImage(image_path)
+        if image.isNull():
+            return None
+        image = image.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        if image.width() != width or image.height() != height:
+            # 与原先 drawPixmap(窗口矩形, 背景图) 一样整张画满窗口
+            image = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._store(entry, image.convertToFormat(QImage.Format_RGB32))
+        return image
+
+    def _store(self, entry, image):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 同一时间只用一张背景，旧尺寸/旧图片的缓存直接删掉
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".bmp") and os.path.join(self.cache_dir, name) != entry:
+                    os.remove(os.path.join(self.cache_dir, name))
+            tmp_path = entry + ".tmp"
+            if image.save(tmp_path, "BMP"):
+                os.replace(tmp_path, entry)
+        except Exception as e:
+            print(f"Background Cache Error: {e}")
+
+    def render(self, image_path, width, height, radius):
+        image = self.load_scaled(image_path, width, height)
+        canvas = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        canvas.fill(Qt.transparent)
+        painter = QPainter(canvas)
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(canvas.rect()), radius, radius)
+        if image is not None:
+            painter.setClipPath(path)
+            painter.drawImage(0, 0, image)
+        else:
+            painter.fillPath(path, QBrush(QColor(self.FALLBACK_COLOR)))
+        painter.end()
+        return QPixmap.fromImage(canvas)
+
 # ==========================================
 #           主窗口逻辑
 # ==========================================
 class MainWindow(QMainWindow):
-    def __init__(self):
+    first_painted = pyqtSignal()  # 首帧绘制完成，非关键的启动工作在这之后进行
+    DRAG_SWITCH_DELAY_MS = 250    # 拖拽时在侧边栏分类上停留这么久才切换过去
+
+    def __init__(self, resident=False):
         super().__init__()
         self.current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
         self.drag_pos = None
+        self.resident = resident  # 常驻模式：关闭窗口只隐藏，进程留在后台等待唤起
         
-        # 数据库路径 .res/data.db
-        db_path = os.path.join(self.current_dir, ".res", "data.db")
-        self.db = DatabaseManager(db_path)
+        # 数据库 (.res/data.db) 在首帧绘制后再打开，见 initial_load
+        self.db = None
+        self.painted = False
+        self.icon_disk_cache = IconDiskCache(os.path.join(self.current_dir, ".res", "icon_cache"),
+                                             USER_CONFIG["ITEM_CONFIG"]["ICON_SIZE"])
+        self.icon_loader = IconLoader(self.current_dir, self.icon_disk_cache, self)
+        self.launcher = AppLauncher(self)
+        self.launcher.launched.connect(self.on_app_launched)
+        self.launcher.failed.connect(lambda path, error: self.desc_label.setText(f"启动失败: {error}"))
+        self.launcher.missing.connect(self.on_app_missing)
+        self.health = PathHealthMonitor(self.current_dir, USER_CONFIG["HEALTH_TTL_SECONDS"], self)
+        self.health.changed.connect(self.on_health_changed)
         
-        self.data = {} 
+        self.catalog = ToolCatalog(self)
+        self.search_index = SearchIndex()
+        self.search_results = None  # 非 None 时网格显示的是搜索结果
         self.dragging_tool_data = None 
-        self.is_dirty = False 
+        self.folder_import = None  # 正在进行的批量导入 (FolderImportJob)
+        self.import_progress = None
+        self.import_added = 0
+        # 拖拽经过侧边栏时不立即切换分类，停留 DRAG_SWITCH_DELAY_MS 后才切换
+        self.drag_hover_item = None
+        self.drag_hover_timer = QTimer(self)
+        self.drag_hover_timer.setSingleShot(True)
+        self.drag_hover_timer.setInterval(self.DRAG_SWITCH_DELAY_MS)
+        self.drag_hover_timer.timeout.connect(self.switch_to_hovered_category)
         
         self.W = USER_CONFIG.get("WINDOW_WIDTH", 1280)
         self.H = USER_CONFIG.get("WINDOW_HEIGHT", 760)
@@ -721,8 +2330,10 @@ class MainWindow(QMainWindow):
 
         self.setup_window()
         self.setup_ui()
-        
-        QTimer.singleShot(10, self.initial_load)
+        self.connect_catalog()
+        self.first_painted.connect(self.initial_load)
+        self.first_painted.connect(self.start_config_watcher)
+        STARTUP.mark("window built")
 
     def setup_window(self):
         self.setFixedSize(self.W, self.H)
@@ -731,37 +2342,45 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(USER_CONFIG.get("TITLE_TEXT", "LLSKY9工具箱"))
 
     def setup_ui(self):
-        # 背景
+        self.apply_app_stylesheet()  # 先于网格控件设置，控件创建时只 polish 一次
+        # 背景：预先缩放并裁好圆角，绘制时直接贴图
         bg_path = os.path.join(self.current_dir, USER_CONFIG.get("BG_IMAGE", ""))
-        self.bg_pixmap = None
-        if os.path.exists(bg_path):
-            self.bg_pixmap = QPixmap(bg_path).scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        background = WindowBackground(os.path.join(self.current_dir, ".res", "bg_cache"))
+        self.bg_pixmap = background.render(bg_path, self.width(), self.height(), self.border_radius)
 
         self.create_sidebar()
         self.create_content_area()
         self.create_top_elements()
+        self.apply_config()
 
     def paintEvent(self, event):
+        # 只重绘需要更新的区域；四角已是透明像素，按 Source 模式原样覆盖即可
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing) 
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(self.rect()), self.border_radius, self.border_radius)
-        painter.setClipPath(path)
-        if self.bg_pixmap: painter.drawPixmap(self.rect(), self.bg_pixmap)
-        else: painter.fillPath(path, QBrush(QColor("#2b2b2b")))
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        rect = event.rect()
+        painter.drawPixmap(rect, self.bg_pixmap, rect)
+        painter.end()
+        if not self.painted:
+            self.painted = True
+            STARTUP.mark("first paint")
+            QTimer.singleShot(0, self.first_painted.emit)
+
+    def start_hidden(self):
+        """常驻启动时窗口不显示，不等待首帧直接开始加载"""
+        if not self.painted:
+            self.painted = True
+            QTimer.singleShot(0, self.first_painted.emit)
 
     def create_sidebar(self):
         container = QWidget(self)
         container.setGeometry(0, 0, self.SIDEBAR_W, self.H)
         container.setStyleSheet("background: transparent;") 
 
-        title = QLabel(USER_CONFIG["TITLE_TEXT"], container)
-        title.setGeometry(*USER_CONFIG["TITLE_Geometry"]) 
-        title.setAlignment(Qt.AlignCenter)
-        f_size = USER_CONFIG["FONT_SIZES"]["APP_TITLE"]
-        title.setStyleSheet(f"color: white; font-family: '{USER_CONFIG['FONT_FAMILY']}'; font-size: {f_size}px; font-weight: bold;")
+        self.title_label = QLabel(container)
+        self.title_label.setAlignment(Qt.AlignCenter)
 
         self.create_management_buttons(container)
+        self.create_search_box(container)
         
         self.category_list = QListWidget(container)
         self.category_list.setGeometry(0, 130, self.SIDEBAR_W, self.H - 170) 
@@ -774,30 +2393,13 @@ class MainWindow(QMainWindow):
         self.category_list.setDefaultDropAction(Qt.MoveAction)
         self.category_list.model().rowsMoved.connect(self.on_category_reordered)
 
-        cat_f_size = USER_CONFIG["FONT_SIZES"]["CATEGORY"]
-        self.category_list.setStyleSheet(f"""
-            QListWidget {{ background: transparent; border: none; outline: 0; }}
-            QListWidget::item {{
-                height: 45px;
-                color: rgba(255,255,255,0.7);
-                font-family: '{USER_CONFIG['FONT_FAMILY']}';
-                font-size: {cat_f_size}px;
-                padding-left: 0px; 
-                margin-bottom: 2px;
-                border: none;
-            }}
-            QListWidget::item:hover {{ color: #ffffff; padding-left: 20px; background: rgba(255,255,255,0.1); }}
-            QListWidget::item:selected {{ color: #00aaff; font-weight: bold; background: rgba(255, 255, 255, 30); border-left: 4px solid #00aaff; }}
-        """)
         self.category_list.currentItemChanged.connect(self.on_category_changed)
+        self.category_list.itemClicked.connect(lambda item: self.clear_search())
         self.category_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.category_list.customContextMenuRequested.connect(self.on_category_context_menu)
 
-        ver = QLabel(USER_CONFIG["VERSION_TEXT"], container)
-        ver.setGeometry(*USER_CONFIG["VERSION_Geometry"])
-        ver.setAlignment(Qt.AlignCenter)
-        v_f_size = USER_CONFIG["FONT_SIZES"]["VERSION"]
-        ver.setStyleSheet(f"color: rgba(255,255,255,0.3); font-size: {v_f_size}px;")
+        self.version_label = QLabel(container)
+        self.version_label.setAlignment(Qt.AlignCenter)
 
     def create_management_buttons(self, parent):
         y_start = 75; h = 25
@@ -815,6 +2417,17 @@ class MainWindow(QMainWindow):
         btn_add_tool.setCursor(Qt.PointingHandCursor)
         btn_add_tool.mousePressEvent = lambda e: self.add_software()
 
+    def create_search_box(self, parent):
+        self.search_input = QLineEdit(parent)
+        self.search_input.setGeometry(5, 104, self.SIDEBAR_W - 10, 22)
+        self.search_input.setPlaceholderText("🔍 搜索全部软件 (Ctrl+F)")
+        self.search_input.setStyleSheet("QLineEdit { background: rgba(255,255,255,0.1); color: white; border: 1px solid rgba(255,255,255,0.2); border-radius: 5px; padding-left: 5px; font-size: 12px; } QLineEdit:focus { border: 1px solid #00aaff; }")
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        self.search_input.returnPressed.connect(self.launch_first_result)
+
+        QShortcut(QKeySequence("Ctrl+F"), self, activated=self.focus_search)
+        QShortcut(QKeySequence(Qt.Key_Escape), self.search_input, activated=self.clear_search, context=Qt.WidgetShortcut)
+
     def create_content_area(self):
         self.scroll_area = QScrollArea(self)
         self.scroll_area.setGeometry(self.SIDEBAR_W, 60, self.CONTENT_W, self.H - 60)
@@ -823,45 +2436,119 @@ class MainWindow(QMainWindow):
         self.scroll_area.setStyleSheet("QScrollArea { background: transparent; } QScrollBar:vertical { width: 6px; background: transparent; } QScrollBar::handle:vertical { background: rgba(255,255,255,0.2); border-radius: 3px; } QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; } QScrollBar::sub-page:vertical, QScrollBar::add-page:vertical { background: none; }")
         self.responsive_container = ResponsiveContainer()
         self.responsive_container.set_window_instance(self) 
-        self.responsive_container.setStyleSheet("background: transparent;")
+        # 样式见 STYLES["APP"]：祖先控件上不带选择器的样式会压过应用级样式表，所以不在这里设置
+        self.responsive_container.setObjectName("ToolGrid")
         self.scroll_area.setWidget(self.responsive_container)
+        # 虚拟化网格：滚动时按需创建/回收可视范围内的控件
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.responsive_container.on_scrolled)
 
     def create_top_elements(self):
         self.desc_label = QLabel("", self)
-        self.desc_label.setGeometry(*USER_CONFIG["DESC_Geometry"])
         self.desc_label.setAlignment(USER_CONFIG["DESC_ALIGN"])
-        d_f_size = USER_CONFIG["FONT_SIZES"]["DESCRIPTION"]
-        self.desc_label.setStyleSheet(f"color: rgba(255,255,255,0.9); font-family: '{USER_CONFIG['FONT_FAMILY']}'; font-size: {d_f_size}px;")
-
-        close_conf = USER_CONFIG["BTN_CLOSE"]
-        btn_close = QLabel(close_conf["TEXT"], self)
-        btn_close.setGeometry(*close_conf["GEOMETRY"])
-        btn_close.setAlignment(Qt.AlignCenter)
-        btn_close.setStyleSheet(f"QLabel {{ color: white; font-size: {close_conf['FONT_SIZE']}px; background: transparent; }} QLabel:hover {{ background-color: rgba(255, 0, 0, 0.3); }}")
-        btn_close.setCursor(Qt.PointingHandCursor)
-        btn_close.mousePressEvent = lambda e: self.close() 
+
+        self.btn_close = QLabel(USER_CONFIG["BTN_CLOSE"]["TEXT"], self)
+        self.btn_close.setAlignment(Qt.AlignCenter)
+        self.btn_close.setCursor(Qt.PointingHandCursor)
+        self.btn_close.mousePressEvent = lambda e: self.close() 
         
-        min_conf = USER_CONFIG["BTN_MIN"]
-        btn_min = QLabel(min_conf["TEXT"], self)
-        btn_min.setGeometry(*min_conf["GEOMETRY"])
-        btn_min.setAlignment(Qt.AlignCenter)
-        btn_min.setStyleSheet(f"QLabel {{ color: white; font-size: {min_conf['FONT_SIZE']}px; background: transparent; }} QLabel:hover {{ background-color: rgba(255, 255, 255, 0.1); }}")
-        btn_min.setCursor(Qt.PointingHandCursor)
-        btn_min.mousePressEvent = lambda e: self.showMinimized()
+        self.btn_min = QLabel(USER_CONFIG["BTN_MIN"]["TEXT"], self)
+        self.btn_min.setAlignment(Qt.AlignCenter)
+        self.btn_min.setCursor(Qt.PointingHandCursor)
+        self.btn_min.mousePressEvent = lambda e: self.showMinimized()
+
+    def apply_config(self):
+        """把 USER_CONFIG 中的文字、位置和预先生成的样式表应用到界面 (启动及配置热重载时调用)"""
+        styles = USER_CONFIG["STYLES"]
+        self.apply_app_stylesheet()
+        self.title_label.setText(USER_CONFIG["TITLE_TEXT"])
+        self.title_label.setGeometry(*USER_CONFIG["TITLE_Geometry"])
+        self.title_label.setStyleSheet(styles["TITLE"])
+        self.category_list.setStyleSheet(styles["CATEGORY_LIST"])
+        self.version_label.setText(USER_CONFIG["VERSION_TEXT"])
+        self.version_label.setGeometry(*USER_CONFIG["VERSION_Geometry"])
+        self.version_label.setStyleSheet(styles["VERSION"])
+        self.desc_label.setGeometry(*USER_CONFIG["DESC_Geometry"])
+        self.desc_label.setStyleSheet(styles["DESCRIPTION"])
+        self.btn_close.setGeometry(*USER_CONFIG["BTN_CLOSE"]["GEOMETRY"])
+        self.btn_close.setStyleSheet(styles["BTN_CLOSE"])
+        self.btn_min.setGeometry(*USER_CONFIG["BTN_MIN"]["GEOMETRY"])
+        self.btn_min.setStyleSheet(styles["BTN_MIN"])
+
+    def apply_app_stylesheet(self):
+        """网格控件共用的应用级样式表；内容不变时不重新设置 (设置会让所有控件重新 polish)"""
+        app = QApplication.instance()
+        if app.styleSheet() != USER_CONFIG["STYLES"]["APP"]:
+            app.setStyleSheet(USER_CONFIG["STYLES"]["APP"])
+
+    def on_config_changed(self):
+        """config.ini 被修改：重新应用样式，已有的工具控件就地更新"""
+        self.apply_config()
+        self.responsive_container.apply_config()
+        app = QApplication.instance()
+        if app.font().family() != USER_CONFIG["FONT_FAMILY"]:
+            font = QFont(USER_CONFIG["FONT_FAMILY"])
+            font.setStyleStrategy(QFont.PreferAntialias)
+            app.setFont(font)
+        print("Config reloaded (window size, sidebar ratio, background and icon size apply after restart)")
+
+    def connect_catalog(self):
+        """界面按 catalog 的变更信号局部更新"""
+        # 搜索索引先于界面更新：显示搜索结果时，界面的槽函数会立即重新查询
+        self.catalog.reset.connect(lambda: self.search_index.rebuild(self.catalog.data))
+        self.catalog.tool_inserted.connect(lambda cat, idx, tool: self.search_index.add(tool))
+        self.catalog.tool_updated.connect(self.search_index.update)
+        self.catalog.tool_removed.connect(lambda cat, idx, tool: self.search_index.remove(tool))
+        self.catalog.tools_added.connect(lambda cat, tools: self.search_index.add_many(tools))
+        self.catalog.category_removed.connect(
+            lambda name, tools: [self.search_index.remove(tool) for tool in tools])
+
+        self.catalog.reset.connect(self.refresh_ui_from_memory)
+        self.catalog.category_added.connect(self.on_catalog_category_added)
+        self.catalog.category_renamed.connect(self.on_catalog_category_renamed)
+        self.catalog.category_removed.connect(self.on_catalog_category_removed)
+        self.catalog.categories_reordered.connect(self.on_catalog_categories_reordered)
+        self.catalog.tool_inserted.connect(self.on_catalog_tool_inserted)
+        self.catalog.tool_updated.connect(self.responsive_container.refresh_tool)
+        self.catalog.tool_removed.connect(self.on_catalog_tool_removed)
+        self.catalog.tools_added.connect(self.on_catalog_tools_added)
+
+        # 文件健康检查随数据更新
+        self.catalog.reset.connect(lambda: self.health.track(self.catalog.data))
+        self.catalog.tool_inserted.connect(lambda cat, idx, tool: self.health.add(tool))
+        self.catalog.tool_updated.connect(self.health.add)
+        self.catalog.tool_removed.connect(lambda cat, idx, tool: self.health.remove(tool))
+        self.catalog.category_removed.connect(lambda name, tools: [self.health.remove(tool) for tool in tools])
+        self.catalog.tools_added.connect(lambda cat, tools: self.health.add_found(tools))
+
+    def start_config_watcher(self):
+        self.config_watcher = ConfigWatcher(self.current_dir, parent=self)
+        self.config_watcher.changed.connect(self.on_config_changed)
 
     def initial_load(self):
-        """启动时读取数据库"""
-        self.data = self.db.load_all_data()
-        self.is_dirty = False
-        self.refresh_ui_from_memory()
-        self.preloader = IconPreloader(self.data, self.current_dir)
-        self.preloader.start()
+        """启动时 (首帧之后) 打开并读取数据库；常驻模式放弃修改时也用于重新加载"""
+        if self.db is None:
+            self.db = DatabaseManager(os.path.join(self.current_dir, ".res", "data.db"),
+                                      backup_policy=USER_CONFIG["BACKUP"],
+                                      journal_mode=USER_CONFIG["JOURNAL_MODE"])
+            STARTUP.mark("db open")
+        self.catalog.load(self.db.load_all_data())
+        STARTUP.mark("data loaded")
+        # 当前分类的图标已由 ToolItem 优先请求，这里排队其余分类
+        self.icon_loader.request_all(self.catalog.data)
+        # 清理旧图标尺寸、已删除/已修改的工具留下的缩略图
+        keys = [IconLoader.request_key(tool) for tools in self.catalog.data.values() for tool in tools]
+        # 不放进全局线程池：Qt 缩放大图时会在全局线程池中分段并等待，占用它可能与持有 GIL 的缩放互相等待
+        self.icon_loader.pool.start(IconCachePruneJob(self.icon_disk_cache, self.current_dir, keys), -1)
+        if self.icon_loader.is_idle():
+            STARTUP.finish("icons ready")
+        else:
+            self.icon_loader.idle.connect(lambda: STARTUP.finish("icons ready"))
 
     def refresh_ui_from_memory(self):
-        """只从内存 self.data 刷新 UI"""
+        """从内存 catalog 完整重建 UI (只在整体重新加载时使用)"""
         current_row = self.category_list.currentRow()
         self.category_list.clear()
-        for category in self.data.keys():
+        for category in self.catalog.data.keys():
             item = QListWidgetItem(category)
             item.setTextAlignment(Qt.AlignCenter) 
             self.category_list.addItem(item)
@@ -875,27 +2562,160 @@ class MainWindow(QMainWindow):
 
     def on_category_changed(self, item):
         if not item: return
-        self.responsive_container.clear_tools()
-        cat_name = item.text()
-        tools = self.data.get(cat_name, [])
-        for tool_obj in tools:
-            if self.dragging_tool_data == tool_obj: continue
-            btn = ToolItem(tool_obj, self) 
-            self.responsive_container.add_tool(btn)
+        if self.search_results is not None:
+            # 切换分类即退出搜索
+            self.search_results = None
+            self.search_input.blockSignals(True)
+            self.search_input.clear()
+            self.search_input.blockSignals(False)
+        self.show_tools(self.catalog.data.get(item.text(), []))
+
+    def show_tools(self, tools):
+        container = self.responsive_container
+        container.begin_update()
+        container.clear_tools()
+        dragging = self.dragging_tool_data
+        container.add_tools(tools if dragging is None else [t for t in tools if t is not dragging])
+        container.end_update()
+
+    # ---------- 拖拽经过侧边栏 ----------
+    def hover_category_while_dragging(self, item):
+        """拖拽中鼠标所在的侧边栏分类 (不在侧边栏或就是当前分类时为 None)"""
+        if item is self.drag_hover_item:
+            return
+        self.drag_hover_item = item
+        if item is None:
+            self.drag_hover_timer.stop()
+            return
+        self.drag_hover_timer.start()
+        # 很可能要切过去：先在后台加载它第一屏的图标
+        tools = self.catalog.data.get(item.text(), [])
+        self.icon_loader.request(tools[:self.responsive_container.page_cells], urgent=True)
+
+    def switch_to_hovered_category(self):
+        """停留时间已到 (或在分类上松开了鼠标)：切换过去并把占位框放到末尾"""
+        self.drag_hover_timer.stop()
+        item, self.drag_hover_item = self.drag_hover_item, None
+        if item is None or self.dragging_tool_data is None:
+            return
+        self.category_list.setCurrentItem(item)
+        self.responsive_container.add_placeholder_at_index()
 
     def on_category_reordered(self, parent, start, end, destination, row):
-        new_data = {}
+        # 侧边栏已经完成了拖拽排序，只需同步到 catalog
+        names = [self.category_list.item(i).text() for i in range(self.category_list.count())]
+        self.catalog.reorder_categories(names)
+
+    def current_category(self):
+        item = self.category_list.currentItem()
+        return item.text() if item else None
+
+    def find_category_item(self, name):
         for i in range(self.category_list.count()):
-            cat_name = self.category_list.item(i).text()
-            if cat_name in self.data:
-                new_data[cat_name] = self.data[cat_name]
-        self.data = new_data
-        self.is_dirty = True 
+            item = self.category_list.item(i)
+            if item.text() == name:
+                return item
+        return None
+
+    def on_catalog_category_added(self, name, index):
+        item = QListWidgetItem(name)
+        item.setTextAlignment(Qt.AlignCenter)
+        self.category_list.insertItem(index, item)
+
+    def on_catalog_category_renamed(self, old_name, new_name):
+        item = self.find_category_item(old_name)
+        if item:
+            item.setText(new_name)
+
+    def on_catalog_category_removed(self, name, tools):
+        if self.search_results is not None:
+            self.refresh_search()
+        item = self.find_category_item(name)
+        if item:
+            # 删除当前分类时 QListWidget 会切换到相邻分类并触发 on_category_changed
+            self.category_list.takeItem(self.category_list.row(item))
+        if self.category_list.count() == 0:
+            self.responsive_container.clear_tools()
+
+    def on_catalog_categories_reordered(self):
+        names = list(self.catalog.data)
+        if names == [self.category_list.item(i).text() for i in range(self.category_list.count())]:
+            return  # 来自侧边栏自身的拖拽，顺序已经一致
+        current = self.current_category()
+        self.category_list.blockSignals(True)
+        self.category_list.clear()
+        for name in names:
+            item = QListWidgetItem(name)
+            item.setTextAlignment(Qt.AlignCenter)
+            self.category_list.addItem(item)
+            if name == current:
+                self.category_list.setCurrentItem(item)
+        self.category_list.blockSignals(False)
+
+    def on_catalog_tool_inserted(self, category, index, tool):
+        if self.search_results is not None:
+            self.refresh_search()
+        elif category == self.current_category():
+            self.responsive_container.insert_tool(index, tool)
+
+    def on_catalog_tool_removed(self, category, index, tool):
+        if self.search_results is not None:
+            self.refresh_search()
+        elif category == self.current_category():
+            self.responsive_container.remove_tool(tool)
+
+    def on_catalog_tools_added(self, category, tools):
+        if self.search_results is not None:
+            self.refresh_search()
+        elif category == self.current_category():
+            self.responsive_container.add_tools(tools)
+        self.icon_loader.request(tools)  # 排在可见图标之后，后台慢慢加载
+
+    # ---------- 搜索 ----------
+    def focus_search(self):
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    def on_search_text_changed(self, text):
+        if not text.strip():
+            self.clear_search()
+            return
+        self.refresh_search()
+
+    def refresh_search(self):
+        query = self.search_input.text()
+        self.search_results = self.search_index.search(query)
+        self.show_tools(self.search_results)
+        self.update_description(f"搜索 “{query.strip()}”: {len(self.search_results)} 个结果")
+
+    def clear_search(self):
+        if self.search_results is None:
+            return
+        self.search_input.blockSignals(True)
+        self.search_input.clear()
+        self.search_input.blockSignals(False)
+        self.search_results = None
+        self.update_description("")
+        item = self.category_list.currentItem()
+        if item:
+            self.on_category_changed(item)
+        else:
+            self.responsive_container.clear_tools()
+
+    def launch_first_result(self):
+        if self.search_results:
+            self.launch_app(self.search_results[0].path)
 
     def on_category_context_menu(self, point):
         item = self.category_list.itemAt(point)
-        if not item: return
         menu = QMenu(self)
+        action_import = QAction("📥 从文件夹批量导入...", self)
+        action_import.triggered.connect(self.import_folder)
+        action_import.setEnabled(self.folder_import is None)
+        menu.addAction(action_import)
+        if not item:
+            menu.exec_(self.category_list.mapToGlobal(point))
+            return
         action_add = QAction("在此分类下添加软件", self)
         action_add.triggered.connect(lambda: self.add_software())
         menu.addAction(action_add)
@@ -929,10 +2749,7 @@ class MainWindow(QMainWindow):
     def add_category(self):
         new_category, ok = QInputDialog.getText(self, '添加分类', '请输入新的分类名称:', text='新分类')
         if ok and new_category:
-            if new_category not in self.data:
-                self.data[new_category] = []
-                self.is_dirty = True
-                self.refresh_ui_from_memory()
+            if self.catalog.add_category(new_category):
                 self.category_list.setCurrentRow(self.category_list.count() - 1)
             else:
                 QMessageBox.warning(self, "警告", "分类名称已存在。")
@@ -941,25 +2758,16 @@ class MainWindow(QMainWindow):
         old_name = item.text()
         new_name, ok = QInputDialog.getText(self, '修改分类名称', '请输入新的分类名称:', text=old_name)
         if ok and new_name and new_name != old_name:
-            if new_name in self.data:
+            if new_name in self.catalog.data:
                 QMessageBox.warning(self, "警告", "新分类名称已存在。")
                 return
-            new_data = {}
-            for k, v in self.data.items():
-                if k == old_name: new_data[new_name] = v
-                else: new_data[k] = v
-            self.data = new_data
-            self.is_dirty = True
-            self.refresh_ui_from_memory()
+            self.catalog.rename_category(old_name, new_name)
 
     def delete_category(self, item):
         name = item.text()
         reply = QMessageBox.question(self, '确认删除', f"删除分类 '{name}' 会移除内存中的该分类！\n只有退出时保存才会生效。", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            if name in self.data:
-                del self.data[name]
-                self.is_dirty = True
-                self.refresh_ui_from_memory()
+            self.catalog.remove_category(name)
 
     def add_software(self):
         current_item = self.category_list.currentItem()
@@ -969,37 +2777,72 @@ class MainWindow(QMainWindow):
         category = current_item.text()
         dialog = AddEditSoftwareDialog(self, category)
         if dialog.exec_() == QDialog.Accepted and dialog.result_data:
-            self.data[category].append(dialog.result_data)
-            self.is_dirty = True
-            self.refresh_ui_from_memory()
+            self.catalog.insert_tool(category, dialog.result_data)
+
+    def import_folder(self):
+        """选择文件夹，后台扫描其中的程序并按文件夹建立分类 (只改内存，退出时保存)"""
+        if self.folder_import is not None:
+            return
+        root = QFileDialog.getExistingDirectory(self, "选择要导入的文件夹", self.current_dir)
+        if not root:
+            return
+        existing = {os.path.normcase(os.path.normpath(self.health.full_path(tool)))
+                    for tools in self.catalog.data.values() for tool in tools}
+        signals = FolderImportSignals(self)
+        signals.batch.connect(self.on_import_batch)
+        signals.finished.connect(self.on_import_finished)
+        self.folder_import = FolderImportJob(root, self.current_dir, existing, signals)
+        self.import_added = 0
+
+        self.import_progress = QProgressDialog("正在扫描...", "取消", 0, 0, self)
+        self.import_progress.setWindowTitle("批量导入")
+        self.import_progress.setMinimumDuration(300)  # 很快就结束的导入不弹出进度框
+        self.import_progress.setValue(0)              # 开始计时 (总数未知，显示为忙碌状态)
+        self.import_progress.canceled.connect(self.folder_import.cancel)
+        QThreadPool.globalInstance().start(self.folder_import)
+
+    def on_import_batch(self, groups, dirs_scanned, found):
+        if self.folder_import is None or self.folder_import.cancelled:
+            return  # 取消后仍在队列里的批次丢弃
+        for category, tools in groups:
+            if category not in self.catalog.data:
+                self.catalog.add_category(category)
+            self.catalog.insert_tools(category, tools)
+            self.import_added += len(tools)
+        if self.import_progress is not None:
+            self.import_progress.setLabelText(f"已扫描 {dirs_scanned} 个文件夹，新增 {self.import_added} 个软件...")
+        self.folder_import.acknowledge()
+
+    def on_import_finished(self, skipped, cancelled):
+        self.folder_import = None
+        if self.import_progress is not None:
+            self.import_progress.canceled.disconnect()
+            self.import_progress.close()
+            self.import_progress.deleteLater()
+            self.import_progress = None
+        state = "导入已取消" if cancelled else "导入完成"
+        self.desc_label.setText(f"{state}: 新增 {self.import_added} 个软件，跳过已存在的 {skipped} 个 (退出时保存)")
 
     def edit_software(self, tool_data):
-        current_item = self.category_list.currentItem()
-        if not current_item: return
-        category = current_item.text()
+        # 搜索结果中的工具不一定属于当前分类
+        category = self.catalog.category_of(tool_data)
+        if not category: return
         dialog = AddEditSoftwareDialog(self, category, tool_data)
         if dialog.exec_() == QDialog.Accepted and dialog.result_data:
-            tools_list = self.data[category]
-            if tool_data in tools_list:
-                idx = tools_list.index(tool_data)
-                tools_list[idx] = dialog.result_data
-                self.is_dirty = True
-                self.refresh_ui_from_memory()
+            self.icon_loader.forget(tool_data)
+            new_data = dialog.result_data
+            self.catalog.update_tool(tool_data, new_data.name, new_data.desc, new_data.path, new_data.url)
 
     def delete_software(self, tool_data):
-        current_item = self.category_list.currentItem()
-        if not current_item: return
-        category = current_item.text()
+        category = self.catalog.category_of(tool_data)
+        if not category: return
         reply = QMessageBox.question(self, '确认删除', f"确定要从列表中移除 '{tool_data.name}' 吗?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            tools_list = self.data.get(category, [])
-            if tool_data in tools_list:
-                tools_list.remove(tool_data)
-                self.is_dirty = True
-                self.refresh_ui_from_memory()
+            if self.catalog.remove_tool(category, tool_data):
+                self.icon_loader.forget(tool_data)
 
     def closeEvent(self, event):
-        if self.is_dirty:
+        if self.catalog.is_dirty:
             reply = QMessageBox.question(
                 self, '保存更改',
                 "检测到布局或数据已修改。\n是否保存到数据库？\n(同时会创建旧版本的备份到 save 目录)", 
@@ -1008,45 +2851,94 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                if self.db.save_snapshot(self.data):
-                    # 保存成功，强制退出
-                    os._exit(0)
-                else:
+                if not self.db.apply_changes(self.catalog.data, self.catalog.pending_changes):
                     QMessageBox.critical(self, "错误", "保存失败！无法写入数据库。")
                     event.ignore()
+                    return
+                self.catalog.mark_saved()
             
             elif reply == QMessageBox.No:
-                # 放弃修改，强制退出
-                os._exit(0)
+                # 放弃修改：常驻时从数据库重新加载，保证下次唤起看到的是已保存的数据
+                if self.resident:
+                    self.initial_load()
             
             else:
                 event.ignore()
+                return
+
+        if self.resident:
+            # 常驻模式：只隐藏窗口
+            event.ignore()
+            self.hide()
+            return
+        # 关闭常驻连接 (WAL 模式下顺带完成检查点)，然后强制退出
+        if self.db:
+            self.db.close()
+        os._exit(0)
+
+    # ================= 单实例命令 =================
+    def summon(self):
+        """唤起窗口 (已构建好的窗口直接显示，无需重新加载)"""
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def find_tool(self, name):
+        for tools in self.catalog.data.values():
+            for tool in tools:
+                if tool.name == name:
+                    return tool
+        return None
+
+    def on_instance_message(self, message):
+        command, _, arg = message.partition(" ")
+        if command == "show":
+            self.summon()
+        elif command == "run":
+            tool = self.find_tool(arg)
+            if tool:
+                self.launch_app(tool.path)
+            else:
+                print(f"Tool not found: {arg}")
+        elif command == "quit":
+            self.resident = False
+            if self.catalog.is_dirty:
+                self.summon()
+            self.close()
         else:
-            # 无修改，强制退出
-            os._exit(0)
+            print(f"Unknown instance command: {message}")
 
     def update_description(self, text):
         self.desc_label.setText(text)
 
-    def launch_app(self, path):
-        full_path = os.path.join(self.current_dir, path.lstrip(os.sep))
-        self.desc_label.setText(f"正在启动: {os.path.basename(path)}...")
-        if not os.path.exists(full_path):
+    def launch_app(self, path, clicked_at=None):
+        full_path = resolve_tool_path(self.current_dir, path)
+        # 只查后台扫描的缓存；缓存未命中的失效文件由启动线程报告 (on_app_missing)
+        if self.health.is_missing(full_path):
             self.desc_label.setText("错误: 文件不存在！")
             return
-        def _run():
-            try:
-                if os.name == 'nt': os.startfile(full_path)
-                else: subprocess.Popen([full_path], cwd=os.path.dirname(full_path))
-                time.sleep(1) 
-                QTimer.singleShot(0, lambda: self.desc_label.setText(""))
-            except Exception as e: 
-                QTimer.singleShot(0, lambda: self.desc_label.setText(f"启动失败: {e}"))
-        threading.Thread(target=_run, daemon=True).start()
+        self.desc_label.setText(f"正在启动: {os.path.basename(path)}...")
+        if not self.launcher.launch(full_path, clicked_at):
+            self.desc_label.setText("启动请求过多，请稍候...")
+
+    def on_app_missing(self, full_path):
+        self.desc_label.setText("错误: 文件不存在！")
+        self.health.mark(full_path, False)
+
+    def on_health_changed(self, paths):
+        """文件存在状态变化：只更新正在显示的控件，其余控件绑定时会读取缓存"""
+        for tool_data, item in self.responsive_container.widgets.items():
+            if self.health.full_path(tool_data) in paths:
+                item.update_health()
+
+    def on_app_launched(self, record):
+        self.desc_label.setText(f"已启动: {os.path.basename(record.path)} ({record.latency_ms:.0f} ms)")
+        QTimer.singleShot(1000, lambda: self.desc_label.setText(""))
     
     def open_folder(self, path):
-        full_path = os.path.join(self.current_dir, path.lstrip(os.sep))
+        full_path = resolve_tool_path(self.current_dir, path)
         target = full_path if os.path.isdir(full_path) else os.path.dirname(full_path)
+        import subprocess
         if os.name == 'nt': subprocess.Popen(f'explorer /select,"{os.path.abspath(full_path)}"', shell=True)
         elif sys.platform == 'darwin': subprocess.Popen(['open', os.path.abspath(target)])
         else: subprocess.Popen(['xdg-open', os.path.abspath(target)])
@@ -1062,13 +2954,30 @@ class MainWindow(QMainWindow):
 
 if __name__ == "__main__":
     current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+    message, resident = _message, _resident
+    server_name = instance_server_name(current_dir)
+
     if not load_config(current_dir): sys.exit(1)
+    STARTUP.mark("config")
     
     app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
     font = QFont(USER_CONFIG["FONT_FAMILY"])
     font.setStyleStrategy(QFont.PreferAntialias)
     app.setFont(font)
+    STARTUP.mark("QApplication")
     
-    win = MainWindow()
-    win.show()
+    win = MainWindow(resident or USER_CONFIG["RESIDENT"])
+
+    # 单实例套接字和 --launch 命令都放到首帧之后 (此时数据已加载)
+    instance_server = InstanceServer(server_name, app)
+    instance_server.message_received.connect(win.on_instance_message)
+    win.first_painted.connect(instance_server.listen)
+    if message.startswith("run "):
+        win.first_painted.connect(lambda: win.on_instance_message(message))
+
+    if resident:
+        win.start_hidden()
+    else:
+        win.show()
     sys.exit(app.exec_())
@@ -0,0 +1,148 @@
+"""LLSKY9 工具箱命令行入口 (不导入 Qt)
+
+    python main.py list [--category 分类]
+    python main.py run 工具名 [--category 分类] [--wait]
+    python main.py backups
+    python main.py restore [备份文件名]
+    python main.py fix-paths [--dry-run | --apply] [--report 报告.json|报告.csv]
+
+list / run 只读打开 .res/data.db，按界面相同的规则解析路径后直接启动工具，适合脚本批量调用。
+restore 用 save 目录中的备份 (默认最新的一个) 替换当前数据库，工具箱窗口 (含常驻实例) 运行时拒绝恢复。
+fix-paths 把绝对路径改为相对路径并检查文件是否存在，默认只预览 (--dry-run)，--apply 才写入。
+"""
+import os
+import sys
+import time
+import argparse
+
+from toolbox_core import DatabaseManager, resolve_tool_path, spawn_tool
+from toolbox_instance import instance_running
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="LLSKY9 工具箱命令行")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = commands.add_parser("list", help="列出工具")
+    list_cmd.add_argument("--category", help="只列出指定分类")
+
+    run_cmd = commands.add_parser("run", help="启动工具")
+    run_cmd.add_argument("name", help="工具名")
+    run_cmd.add_argument("--category", help="同名工具存在于多个分类时指定分类")
+    run_cmd.add_argument("--wait", action="store_true", help="等待工具退出并返回其退出码")
+
+    commands.add_parser("backups", help="列出 save 目录中的备份")
+
+    restore_cmd = commands.add_parser("restore", help="从备份恢复数据库")
+    restore_cmd.add_argument("name", nargs="?", help="备份文件名 (默认最新的一个)")
+
+    fix_cmd = commands.add_parser("fix-paths", help="规范化工具路径并检查失效路径")
+    mode = fix_cmd.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", dest="apply", action="store_false", help="只预览，不修改数据库 (默认)")
+    mode.add_argument("--apply", dest="apply", action="store_true", help="写入数据库 (写入前自动备份)")
+    fix_cmd.set_defaults(apply=False)  # 两个选项共用 dest，否则默认值取 --dry-run (store_false) 的 True
+    fix_cmd.add_argument("--report", help="写出报告文件，扩展名 .json 或 .csv")
+    fix_cmd.add_argument("--all", action="store_true", help="报告中也包含无需处理的工具")
+    fix_cmd.add_argument("--no-check", action="store_true", help="不检查文件是否存在")
+    fix_cmd.add_argument("--workers", type=int, help="检查文件的并行线程数 (默认 32)")
+    fix_cmd.add_argument("-v", "--verbose", action="store_true", help="逐条输出需要修改和失效的路径")
+    return parser
+
+
+def cmd_list(db, args):
+    for category, tool in db.query_tools(category=args.category):
+        print(f"{category}\t{tool.name}\t{tool.path}")
+    return 0
+
+
+def cmd_run(current_dir, db, args):
+    matches = db.query_tools(category=args.category, name=args.name)
+    if not matches:
+        print(f"Tool not found: {args.name}", file=sys.stderr)
+        return 1
+    # 同名时取界面上排在最前面的一个
+    _, tool = matches[0]
+    full_path = resolve_tool_path(current_dir, tool.path)
+    if not os.path.exists(full_path):
+        print(f"File not found: {full_path}", file=sys.stderr)
+        return 1
+    try:
+        popen = spawn_tool(full_path, detach=not args.wait)
+    except Exception as e:
+        print(f"Launch failed: {e}", file=sys.stderr)
+        return 1
+    if args.wait and popen is not None:
+        return popen.wait()
+    return 0
+
+
+def cmd_backups(db, args):
+    for entry in reversed(db.backups.entries()):
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["created"]))
+        print(f"{entry['file']}\t{created}\t{entry['size']}")
+    return 0
+
+
+def cmd_restore(current_dir, db, args):
+    # 运行中的实例还持有内存中的数据，恢复后它再保存会把恢复的内容覆盖掉
+    if instance_running(current_dir):
+        print("Toolbox is running, quit it first (python main.py --quit)", file=sys.stderr)
+        return 1
+    entry = db.backups.find(args.name)
+    if entry is None:
+        print(f"Backup not found: {args.name or '(none)'}", file=sys.stderr)
+        return 1
+    try:
+        db.restore_backup(entry["file"])
+    except Exception as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_fix_paths(current_dir, db, args):
+    import toolbox_maintenance  # 只有维护命令需要，不拖慢 run/list
+    start = time.perf_counter()
+    findings = toolbox_maintenance.scan_paths(db, current_dir, check_exists=not args.no_check,
+                                              workers=max(1, args.workers or toolbox_maintenance.CHECK_WORKERS))
+    counts = toolbox_maintenance.summarize(findings)
+    if args.verbose:
+        for f in findings:
+            if f.status == "fix":
+                print(f"fix\t{f.tool_id}\t{f.name}\t{f.old_path} -> {f.new_path}")
+            if f.exists is False:
+                print(f"missing\t{f.tool_id}\t{f.name}\t{f.new_path}")
+    print(f"Scanned {len(findings)} tools in {time.perf_counter() - start:.2f}s: "
+          f"{counts['fix']} to fix, {counts['keep']} kept (other drive), {counts['skip']} skipped, "
+          f"{counts['missing']} missing")
+    if args.report:
+        written = toolbox_maintenance.write_report(findings, args.report, include_ok=args.all)
+        print(f"Report: {args.report} ({written} rows)")
+    if args.apply:
+        print(f"Updated {toolbox_maintenance.apply_fixes(db, findings)} paths")
+    elif counts["fix"]:
+        print("Dry run, database not modified (use --apply to write)")
+    return 0
+
+
+def main(current_dir, argv):
+    args = build_parser().parse_args(argv)
+    db_path = os.path.join(current_dir, ".res", "data.db")
+    if not os.path.exists(db_path):
+        print(f"Database not found: {db_path}", file=sys.stderr)
+        return 1
+    if args.command == "restore":
+        # 日志模式由界面配置决定，这里不做改动
+        return cmd_restore(current_dir, DatabaseManager(db_path, journal_mode=None), args)
+    if args.command == "fix-paths":
+        return cmd_fix_paths(current_dir, DatabaseManager(db_path, read_only=not args.apply, journal_mode=None), args)
+    db = DatabaseManager(db_path, read_only=True)
+    if args.command == "list":
+        return cmd_list(db, args)
+    if args.command == "backups":
+        return cmd_backups(db, args)
+    return cmd_run(current_dir, db, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(os.path.dirname(os.path.abspath(sys.argv[0])), sys.argv[1:]))
@@ -0,0 +1,569 @@
+"""LLSKY9 工具箱的数据层 (不依赖 Qt)
+
+图形界面 main.py 和命令行入口 toolbox_cli.py 共用：数据对象、数据库读写、路径解析与进程启动。
+"""
+import itertools
+import os
+import sqlite3
+import time
+# shutil / subprocess / pathlib 只在备份、启动和只读连接时用到，在使用处导入以加快启动
+
+# ==========================================
+#      数据对象类 (内存中操作的对象)
+# ==========================================
+class ToolData:
+    """一个工具条目；大目录会常驻成千上万个，所以用 __slots__ 去掉每个实例的 __dict__"""
+    __slots__ = ("name", "desc", "path", "url", "row_id", "uid")
+    _uids = itertools.count(1)
+
+    def __init__(self, name, desc, path, url, row_id=None):
+        self.name = name
+        self.desc = desc
+        self.path = path
+        self.url = url
+        self.row_id = row_id  # 数据库中的 tools.id，新建且未保存时为 None
+        self.uid = next(ToolData._uids)  # 进程内唯一且不变的编号，保存/重排都不影响
+
+# ==========================================
+#      数据库管理类 (负责读取与增量写入)
+# ==========================================
+class DatabaseManager:
+    # 数据库结构迁移步骤，按 PRAGMA user_version 顺序执行 (第 N 项将版本升到 N+1)
+    SCHEMA_MIGRATIONS = [
+        # v1: 为按分类/排序加载添加索引
+        [
+            "CREATE INDEX IF NOT EXISTS idx_tools_category_sort ON tools(category_id, sort_order)",
+            "CREATE INDEX IF NOT EXISTS idx_categories_sort ON categories(sort_order)",
+        ],
+    ]
+
+    # 连接参数：WAL 下 synchronous=NORMAL 仍能保证崩溃后数据库一致；cache_size 为负数表示 KiB
+    PRAGMAS = (
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -8000",
+        "PRAGMA temp_store = MEMORY",
+    )
+
+    def __init__(self, db_path, read_only=False, backup_policy=None, journal_mode="WAL"):
+        self.db_path = db_path
+        # 数据库放在网络共享目录时 WAL 不可用 (依赖共享内存)，需配置为 DELETE
+        self.journal_mode = journal_mode
+        self.conn = None  # 常驻连接，第一次使用时打开
+        # 备份目录 save 位于 .res 同级 (self.db_path 是 .../.res/data.db)
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(db_path)))
+        self.backups = BackupManager(os.path.join(root_dir, "save"), backup_policy)
+        # 只读模式 (命令行查询/启动)：不建表、不迁移，也不会意外创建空数据库
+        self.read_only = read_only
+        if read_only:
+            return
+        # 确保数据库所在的文件夹存在
+        db_dir = os.path.dirname(db_path)
+        if not os.path.exists(db_dir):
+            try:
+                os.makedirs(db_dir)
+            except Exception as e:
+                print(f"Error creating directory {db_dir}: {e}")
+        self.init_db()
+
+    def connection(self):
+        """本对象共用的连接 (只在创建它的线程中使用)"""
+        if self.conn is None:
+            self.conn = self.open_reader() if self.read_only else self._open()
+        return self.conn
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, cached_statements=256)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        if self.journal_mode:  # None 表示沿用数据库当前的模式
+            mode = conn.execute(f"PRAGMA journal_mode = {self.journal_mode}").fetchone()[0]
+            if mode.upper() != self.journal_mode.upper():
+                print(f"Journal mode {self.journal_mode} unavailable, using {mode}")
+        return conn
+
+    def open_reader(self):
+        """新建只读连接，供后台线程或命令行使用 (WAL 下与写入互不阻塞)，用完由调用方关闭"""
+        from pathlib import Path
+        uri = Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA cache_size = -8000")
+        return conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def init_db(self):
+        """初始化数据库表结构"""
+        conn = self.connection()
+        c = conn.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS categories (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT UNIQUE,
+                        sort_order INTEGER DEFAULT 0
+                     )''')
+        c.execute('''CREATE TABLE IF NOT EXISTS tools (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        category_id INTEGER,
+                        name TEXT,
+                        description TEXT,
+                        path TEXT,
+                        url TEXT,
+                        sort_order INTEGER DEFAULT 0,
+                        FOREIGN KEY(category_id) REFERENCES categories(id) ON DELETE CASCADE
+                     )''')
+        conn.commit()
+        self.migrate_schema(conn)
+
+    def migrate_schema(self, conn):
+        """执行尚未应用的结构迁移 (旧数据库升级)"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in enumerate(self.SCHEMA_MIGRATIONS, start=1):
+            if version >= target:
+                continue
+            try:
+                for sql in statements:
+                    conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {target}")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Schema Migration Error (v{target}): {e}")
+                return
+
+    def query_tools(self, category=None, name=None):
+        """按界面顺序查询工具，返回 [(分类名, ToolData)]；category / name 为精确匹配过滤"""
+        sql = """
+            SELECT c.name, t.id, t.name, t.description, t.path, t.url
+            FROM tools t
+            JOIN categories c ON t.category_id = c.id
+        """
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("c.name = ?")
+            params.append(category)
+        if name is not None:
+            conditions.append("t.name = ?")
+            params.append(name)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY c.sort_order ASC, c.id ASC, t.sort_order ASC, t.id ASC"
+
+        return [(cat_name, ToolData(t_name, desc, path, url, tool_id))
+                for cat_name, tool_id, t_name, desc, path, url in self.connection().execute(sql, params)]
+
+    def load_all_data(self):
+        """读取数据库，加载到内存字典中 (单次 JOIN 查询)"""
+        data = {}
+        c = self.connection().cursor()
+
+        # 分类和工具一次查出，按 分类顺序 -> 工具顺序 排列；
+        # LEFT JOIN 保证没有工具的空分类也会出现 (此时 t.id 为 NULL)
+        c.execute("""
+            SELECT c.name, t.id, t.name, t.description, t.path, t.url
+            FROM categories c
+            LEFT JOIN tools t ON t.category_id = c.id
+            ORDER BY c.sort_order ASC, c.id ASC, t.sort_order ASC, t.id ASC
+        """)
+
+        # 说明和网址经常整批相同 (同一套件的工具)，相同的字符串只保留一份
+        shared = {}
+        share = shared.setdefault
+        tool_list = None
+        last_cat = None
+        for cat_name, tool_id, name, desc, path, url in c:
+            if tool_list is None or cat_name != last_cat:
+                tool_list = data.setdefault(cat_name, [])
+                last_cat = cat_name
+            if tool_id is not None:
+                tool_list.append(ToolData(name, share(desc, desc), path, share(url, url), tool_id))
+        return data
+
+    def create_backup(self):
+        """【新增】保存前备份当前数据库 (保留策略见 BackupManager)"""
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            return self.backups.create(self.connection())
+        except Exception as e:
+            print(f"Backup Process Error: {e}")
+            return None
+
+    def restore_backup(self, name):
+        """用 save 目录中的备份替换当前数据库；替换前先为当前数据库做一次备份"""
+        source = self.backups.extract(name)
+        try:
+            self.create_backup()
+            src = sqlite3.connect(source)
+            try:
+                src.backup(self.connection())
+            finally:
+                src.close()
+        finally:
+            if source != self.backups.path_of(name):
+                os.remove(source)
+        print(f"Restored: {name}")
+
+    def save_snapshot(self, data_dict):
+        """一次性将内存数据覆盖写入数据库"""
+        
+        # 【新增】在写入新数据前，先备份旧数据
+        self.create_backup()
+
+        conn = self.connection()
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute("DELETE FROM tools")
+            conn.execute("DELETE FROM categories")
+
+            # 预先分配行号后用 executemany 批量插入；已有行号的工具保留原来的 id
+            conn.executemany("INSERT INTO categories (id, name, sort_order) VALUES (?, ?, ?)",
+                             [(i + 1, name, i) for i, name in enumerate(data_dict)])
+            next_id = self._next_tool_id(conn)
+            used = {tool.row_id for tools_list in data_dict.values() for tool in tools_list if tool.row_id is not None}
+            rows = []
+            for cat_id, tools_list in enumerate(data_dict.values(), start=1):
+                for sort_index, tool in enumerate(tools_list):
+                    if tool.row_id is None:
+                        while next_id in used:
+                            next_id += 1
+                        tool.row_id = next_id
+                        used.add(next_id)
+                    rows.append((tool.row_id, cat_id, tool.name, tool.desc, tool.path, tool.url, sort_index))
+            conn.executemany("""
+                INSERT INTO tools (id, category_id, name, description, path, url, sort_order)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Save Error: {e}")
+            return False
+
+    def apply_changes(self, data_dict, changes):
+        """只把记录下来的增量修改写入数据库 (单个事务)
+
+        changes 为 ToolCatalog.record_change 记录的操作列表，按发生顺序回放；
+        data_dict 用于在最后重写被改动分类的 sort_order。
+        """
+        if not changes:
+            return True
+
+        self.create_backup()
+
+        conn = self.connection()
+        inserted_tools = []
+        pending_inserts = []  # 连续的 add_tool/add_tools 先攒起来，遇到其他操作前用 executemany 一次写入
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            reorder_cats = set()        # 需要重写工具顺序的分类
+            reorder_categories = False  # 是否需要重写分类顺序
+            next_id = self._next_tool_id(conn)
+
+            def flush_inserts():
+                conn.executemany("""
+                    INSERT INTO tools (id, category_id, name, description, path, url, sort_order)
+                    VALUES (?, ?, ?, ?, ?, ?, 0)
+                """, pending_inserts)
+                pending_inserts.clear()
+
+            for op, *args in changes:
+                if pending_inserts and op not in ("add_tool", "add_tools"):
+                    flush_inserts()
+
+                if op == "add_category":
+                    (name,) = args
+                    conn.execute("INSERT INTO categories (name, sort_order) VALUES (?, ?)", (name, 0))
+                    reorder_categories = True
+
+                elif op == "rename_category":
+                    old_name, new_name = args
+                    conn.execute("UPDATE categories SET name=? WHERE name=?", (new_name, old_name))
+                    if old_name in reorder_cats:
+                        reorder_cats.discard(old_name)
+                        reorder_cats.add(new_name)
+
+                elif op == "delete_category":
+                    (name,) = args
+                    # 分类下的工具由外键 ON DELETE CASCADE 一并删除
+                    conn.execute("DELETE FROM categories WHERE name=?", (name,))
+                    reorder_cats.discard(name)
+
+                elif op == "reorder_categories":
+                    reorder_categories = True
+
+                elif op == "add_tool":
+                    category, tool = args
+                    tool.row_id = next_id
+                    next_id += 1
+                    pending_inserts.append((tool.row_id, self._category_id(conn, category),
+                                            tool.name, tool.desc, tool.path, tool.url))
+                    inserted_tools.append(tool)
+                    reorder_cats.add(category)
+
+                elif op == "add_tools":
+                    # 批量导入：同一分类的一批工具只查一次分类 id
+                    category, tools = args
+                    category_id = self._category_id(conn, category)
+                    for tool in tools:
+                        tool.row_id = next_id
+                        next_id += 1
+                        pending_inserts.append((tool.row_id, category_id, tool.name, tool.desc, tool.path, tool.url))
+                    inserted_tools.extend(tools)
+                    reorder_cats.add(category)
+
+                elif op == "edit_tool":
+                    (tool,) = args
+                    conn.execute("UPDATE tools SET name=?, description=?, path=?, url=? WHERE id=?",
+                                 (tool.name, tool.desc, tool.path, tool.url, tool.row_id))
+
+                elif op == "delete_tool":
+                    (tool,) = args
+                    conn.execute("DELETE FROM tools WHERE id=?", (tool.row_id,))
+
+                elif op == "move_tool":
+                    tool, category = args
+                    conn.execute("UPDATE tools SET category_id=? WHERE id=?",
+                                 (self._category_id(conn, category), tool.row_id))
+                    reorder_cats.add(category)
+
+                elif op == "reorder_tools":
+                    (category,) = args
+                    reorder_cats.add(category)
+
+                else:
+                    raise ValueError(f"Unknown change: {op}")
+
+            if pending_inserts:
+                flush_inserts()
+
+            # 只重写被改动分类内的顺序
+            for category in reorder_cats:
+                tools_list = data_dict.get(category)
+                if tools_list:
+                    conn.executemany("UPDATE tools SET sort_order=? WHERE id=?",
+                                     [(i, tool.row_id) for i, tool in enumerate(tools_list)])
+
+            if reorder_categories:
+                conn.executemany("UPDATE categories SET sort_order=? WHERE name=?",
+                                 [(i, name) for i, name in enumerate(data_dict)])
+
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            # 事务已回滚，本次分配的行号全部作废
+            for tool in inserted_tools:
+                tool.row_id = None
+            print(f"Save Error: {e}")
+            return False
+
+    def update_tool_paths(self, updates):
+        """批量修改工具路径 [(新路径, 工具 id)]，单个事务 (维护工具使用，写入前自动备份)"""
+        self.create_backup()
+        conn = self.connection()
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            conn.executemany("UPDATE tools SET path=? WHERE id=?", updates)
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Save Error: {e}")
+            return False
+
+    def _next_tool_id(self, conn):
+        """下一个可用的工具 id (AUTOINCREMENT 不复用已删除的 id，因此同时参考 sqlite_sequence)"""
+        row = conn.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name='tools'), 0),
+                       COALESCE((SELECT MAX(id) FROM tools), 0))
+        """).fetchone()
+        return row[0] + 1
+
+    def _category_id(self, conn, name):
+        row = conn.execute("SELECT id FROM categories WHERE name=?", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Category not found: {name}")
+        return row[0]
+
+# ==========================================
+#      数据库备份 (save 目录)
+# ==========================================
+class BackupManager:
+    """用 SQLite 在线备份接口生成一致的快照，可选 gzip 压缩
+
+    备份记录保存在 save/index.json 中 (按时间先后)，清理时只读索引，不再扫描目录；
+    索引不存在时 (旧版本留下的 data_*.db) 扫描一次目录重建。
+    保留策略 policy: KEEP_COUNT 个数、MAX_AGE_DAYS 天数、MAX_TOTAL_MB 总大小 (0 表示不限)，最新的备份总是保留。
+    policy 为 None (命令行拿不到界面的配置) 时只新增备份，不做清理，以免误删用户想保留的备份。
+    """
+    INDEX_FILE = "index.json"
+    DEFAULT_POLICY = {"KEEP_COUNT": 5, "MAX_AGE_DAYS": 0, "MAX_TOTAL_MB": 0, "COMPRESS": False}
+
+    def __init__(self, save_dir, policy=None):
+        self.save_dir = save_dir
+        self.policy = dict(self.DEFAULT_POLICY, **(policy or {}))
+        self.auto_prune = policy is not None
+        self.index = None  # 第一次用到时加载
+
+    def path_of(self, name):
+        return os.path.join(self.save_dir, name)
+
+    def entries(self):
+        """所有备份记录 [{"file", "created", "size"}]，最旧的在前"""
+        if self.index is None:
+            self.index = self._load_index()
+        return self.index
+
+    def create(self, conn):
+        """备份 conn 所连接的数据库，返回备份文件路径"""
+        # 先加载索引：没有索引时扫描目录重建，这时新备份还没写出，不会被重复记录
+        entries = self.entries()
+        if not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
+        # 同一秒内的备份加序号；索引里的记录也算占用 (文件可能已被手动删除)，否则清理时会误删新备份
+        taken = {e["file"] for e in entries}
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        name = f"data_{timestamp}.db"
+        suffix = 1
+        while any(n in taken or os.path.exists(self.path_of(n)) for n in (name, name + ".gz")):
+            name = f"data_{timestamp}_{suffix}.db"
+            suffix += 1
+
+        # 先写到临时文件，完成后再改名，半成品不会被当成备份
+        part_path = self.path_of(name + ".part")
+        dst = sqlite3.connect(part_path)
+        try:
+            conn.backup(dst)
+        finally:
+            dst.close()
+        if self.policy["COMPRESS"]:
+            import gzip
+            import shutil
+            name += ".gz"
+            with open(part_path, 'rb') as f_in, gzip.open(self.path_of(name + ".part"), 'wb', compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.remove(part_path)
+            part_path = self.path_of(name + ".part")
+        backup_path = self.path_of(name)
+        os.replace(part_path, backup_path)
+        print(f"Backup created: {backup_path}")
+
+        entries.append({"file": name, "created": time.time(), "size": os.path.getsize(backup_path)})
+        if self.auto_prune:
+            self.prune()
+        else:
+            self._save_index()
+        return backup_path
+
+    def prune(self):
+        """按保留策略删除旧备份 (从最旧的开始)"""
+        entries = self.entries()
+        keep_count = self.policy["KEEP_COUNT"]
+        max_age = self.policy["MAX_AGE_DAYS"] * 86400
+        max_bytes = self.policy["MAX_TOTAL_MB"] * 1024 * 1024
+        now = time.time()
+        total = sum(e["size"] for e in entries)
+        while len(entries) > 1:
+            oldest = entries[0]
+            if not ((keep_count and len(entries) > keep_count)
+                    or (max_age and now - oldest["created"] > max_age)
+                    or (max_bytes and total > max_bytes)):
+                break
+            entries.pop(0)
+            total -= oldest["size"]
+            try:
+                os.remove(self.path_of(oldest["file"]))
+                print(f"Removed old backup: {self.path_of(oldest['file'])}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Failed to remove old backup: {e}")
+        self._save_index()
+
+    def find(self, name=None):
+        """按文件名查找备份记录，name 为 None 时返回最新的一个"""
+        entries = self.entries()
+        if name is None:
+            return entries[-1] if entries else None
+        for entry in entries:
+            if entry["file"] == name:
+                return entry
+        return None
+
+    def extract(self, name):
+        """返回可直接用 sqlite3 打开的备份路径 (压缩的备份解压到临时文件)，并检查完整性"""
+        path = self.path_of(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if name.endswith(".gz"):
+            import gzip
+            import shutil
+            plain = self.path_of(name[:-3] + ".restore")
+            with gzip.open(path, 'rb') as f_in, open(plain, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            path = plain
+        conn = sqlite3.connect(path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+        if result != "ok":
+            if path != self.path_of(name):
+                os.remove(path)
+            raise sqlite3.DatabaseError(f"Backup {name} failed integrity check: {result}")
+        return path
+
+    def _load_index(self):
+        import json
+        try:
+            with open(self.path_of(self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._scan()
+        except ValueError as e:
+            print(f"Backup index unreadable, rebuilding: {e}")
+            return self._scan()
+
+    def _scan(self):
+        """从目录重建索引 (旧版本没有索引)"""
+        entries = []
+        if os.path.isdir(self.save_dir):
+            for f in os.listdir(self.save_dir):
+                if f.startswith("data_") and (f.endswith(".db") or f.endswith(".db.gz")):
+                    st = os.stat(self.path_of(f))
+                    entries.append({"file": f, "created": st.st_mtime, "size": st.st_size})
+        entries.sort(key=lambda e: e["created"])
+        return entries
+
+    def _save_index(self):
+        import json
+        if not os.path.exists(self.save_dir):
+            return
+        tmp_path = self.path_of(self.INDEX_FILE + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path_of(self.INDEX_FILE))
+
+# ==========================================
+#      路径解析与启动
+# ==========================================
+def resolve_tool_path(current_dir, path):
+    """数据库中保存的是相对工具箱目录的路径"""
+    return os.path.join(current_dir, path.lstrip(os.sep))
+
+
+def spawn_tool(full_path, detach=False):
+    """启动工具；返回 Popen 句柄 (Windows 下 os.startfile 没有句柄，返回 None)
+
+    detach=True 时子进程脱离当前会话，调用方 (命令行) 退出后工具继续运行。
+    """
+    if os.name == 'nt':
+        os.startfile(full_path)
+        return None
+    import subprocess
+    return subprocess.Popen([full_path], cwd=os.path.dirname(full_path), start_new_session=detach)
@@ -0,0 +1,42 @@
+"""LLSKY9 工具箱的单实例通信 (只依赖标准库)
+
+main.py 在导入 Qt 之前用它把命令转发给已运行的实例，toolbox_cli.py 用它判断界面是否还开着。
+"""
+import hashlib
+import os
+
+
+def instance_server_name(current_dir):
+    """同一安装目录只允许一个实例，不同目录的工具箱互不干扰
+
+    Windows 下是命名管道名，其他系统是 QLocalServer 使用的套接字文件完整路径。
+    """
+    digest = hashlib.sha1(os.path.abspath(current_dir).encode('utf-8')).hexdigest()[:8]
+    name = f"LLSKY9_Toolbox-{digest}"
+    if os.name == 'nt':
+        return name
+    # 与 Qt 的 QDir::tempPath() 规则一致；不导入 tempfile 以加快转发
+    return os.path.join(os.environ.get("TMPDIR") or "/tmp", name)
+
+
+def send_to_instance(server_name, message, timeout=0.5):
+    """把命令发给已运行的实例；没有实例在运行时返回 False"""
+    payload = (message + "\n").encode('utf-8')
+    try:
+        if os.name == 'nt':
+            with open("\\\\.\\pipe\\" + server_name, 'wb', buffering=0) as pipe:
+                pipe.write(payload)
+        else:
+            import socket
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(server_name)
+                sock.sendall(payload)
+        return True
+    except OSError:
+        return False
+
+
+def instance_running(current_dir):
+    """该目录的工具箱界面是否在运行 (发送空命令探测，实例会忽略空行)"""
+    return send_to_instance(instance_server_name(current_dir), "")
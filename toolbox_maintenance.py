@@ -0,0 +1,108 @@
+"""LLSKY9 工具箱的数据维护 (不依赖 Qt)
+
+路径规范化：把数据库中的绝对路径改为相对工具箱目录的路径并统一分隔符，
+同时并行检查每个工具的文件是否存在，标记失效的路径。
+命令行入口见 toolbox_cli.py 的 fix-paths 子命令。
+"""
+import os
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from toolbox_core import resolve_tool_path
+
+# 并行检查文件是否存在的线程数 (网络共享上 stat 很慢，主要是等待 IO)
+CHECK_WORKERS = 32
+
+
+class PathFinding:
+    """一个工具的检查结果
+
+    status: "ok" 无需修改 / "fix" 建议改为 new_path / "keep" 不同盘符，保持绝对路径 / "skip" 无法计算相对路径
+    exists: 文件是否存在 (未检查时为 None)
+    """
+    FIELDS = ("tool_id", "category", "name", "status", "old_path", "new_path", "exists")
+
+    def __init__(self, tool_id, category, name, status, old_path, new_path):
+        self.tool_id = tool_id
+        self.category = category
+        self.name = name
+        self.status = status
+        self.old_path = old_path
+        self.new_path = new_path
+        self.exists = None
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+def normalize_path(old_path, current_dir):
+    """返回 (状态, 新路径)，规则与原来的修复脚本一致"""
+    new_path = old_path
+    # 情况1：绝对路径 (例如 D:\\Tools\\App.exe)
+    if os.path.isabs(old_path):
+        # 与工具箱不在同一个盘符时保持原样
+        curr_drive = os.path.splitdrive(current_dir)[0]
+        target_drive = os.path.splitdrive(old_path)[0]
+        if curr_drive and target_drive and curr_drive.lower() != target_drive.lower():
+            return "keep", old_path
+        try:
+            new_path = os.path.relpath(old_path, current_dir)
+        except ValueError:
+            return "skip", old_path
+    # 情况2：规范化分隔符，去除多余的 ..
+    new_path = os.path.normpath(new_path)
+    return ("fix" if new_path != old_path else "ok"), new_path
+
+
+def scan_paths(db, current_dir, check_exists=True, workers=CHECK_WORKERS):
+    """检查数据库中所有工具的路径，返回 [PathFinding]"""
+    findings = []
+    for category, tool in db.query_tools():
+        if not tool.path:
+            continue
+        status, new_path = normalize_path(tool.path, current_dir)
+        findings.append(PathFinding(tool.row_id, category, tool.name, status, tool.path, new_path))
+
+    if check_exists and findings:
+        # 多个工具指向同一文件时只检查一次
+        targets = {}
+        for finding in findings:
+            full_path = finding.new_path if os.path.isabs(finding.new_path) else resolve_tool_path(current_dir, finding.new_path)
+            targets.setdefault(full_path, []).append(finding)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for full_path, exists in zip(targets, pool.map(os.path.exists, targets)):
+                for finding in targets[full_path]:
+                    finding.exists = exists
+    return findings
+
+
+def apply_fixes(db, findings):
+    """把 status 为 fix 的结果批量写回数据库 (写入前自动备份)，返回修改的条数"""
+    updates = [(f.new_path, f.tool_id) for f in findings if f.status == "fix"]
+    if updates and not db.update_tool_paths(updates):
+        raise RuntimeError("Database update failed")
+    return len(updates)
+
+
+def write_report(findings, report_path, include_ok=False):
+    """按扩展名写出 JSON 或 CSV 报告；默认不包含无需处理的条目"""
+    rows = [f.as_dict() for f in findings if include_ok or f.status != "ok" or f.exists is False]
+    if report_path.lower().endswith(".csv"):
+        with open(report_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=PathFinding.FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=1)
+    return len(rows)
+
+
+def summarize(findings):
+    """各状态的数量以及失效路径数"""
+    counts = {"ok": 0, "fix": 0, "keep": 0, "skip": 0}
+    for finding in findings:
+        counts[finding.status] += 1
+    counts["missing"] = sum(1 for f in findings if f.exists is False)
+    return counts